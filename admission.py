@@ -0,0 +1,196 @@
+"""Admission control in front of the submission store.
+
+Every write from the app goes through a ``SubmissionGate``, which decides
+per submission whether it is stored:
+
+* **duplicate**: the same session already sent identical content within
+  ``dedup_window`` seconds (double clicks, reruns, resubmitted forms);
+* **debounced**: the same session sent something of the same kind less than
+  ``debounce`` seconds ago;
+* **rate_limited**: the session has used up its token bucket of ``rate``
+  submissions per ``per`` seconds;
+* **queued**: the store's write queue is past its high-water mark, so the
+  submission waits in a bounded overflow list and is handed to the store
+  by a background thread as the queue drains. The page returns at once
+  instead of blocking behind everyone else's writes;
+* **busy**: even the overflow list is full; nothing is stored.
+
+Everything else is **accepted** and goes straight to the store.
+
+The thresholds default to the ``WORKSHOP_*`` environment variables below,
+so load tests and unusual rooms can relax them without code changes.
+"""
+import hashlib
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import Future
+
+import metrics
+
+DEDUP_WINDOW = float(os.environ.get("WORKSHOP_DEDUP_WINDOW", "600"))
+DEBOUNCE = float(os.environ.get("WORKSHOP_DEBOUNCE", "2"))
+RATE_LIMIT = int(os.environ.get("WORKSHOP_RATE_LIMIT", "6"))
+RATE_PERIOD = float(os.environ.get("WORKSHOP_RATE_PERIOD", "60"))
+
+ACCEPTED = "accepted"
+QUEUED = "queued"
+DUPLICATE = "duplicate"
+DEBOUNCED = "debounced"
+RATE_LIMITED = "rate_limited"
+BUSY = "busy"
+
+# Statuses under which the submission is (or will be) stored
+STORED = (ACCEPTED, QUEUED)
+
+STATUS_MESSAGES = {
+    QUEUED: "Lots of people are submitting right now. Yours is queued and will appear shortly.",
+    DUPLICATE: "We already have this submission from you, so it was not added twice.",
+    DEBOUNCED: "We just received a submission from you. Please wait a moment before sending another.",
+    RATE_LIMITED: "You are submitting very quickly. Please wait a minute and try again.",
+    BUSY: "The workshop is very busy right now. Please try again in a moment.",
+}
+
+# ``future`` resolves to the stored row id; it is None when nothing was stored
+Admission = namedtuple("Admission", ["status", "future"])
+
+
+def content_hash(kind, args):
+    """Digest of a submission's content, ignoring surrounding whitespace."""
+    normalized = [arg.strip() if isinstance(arg, str) else arg for arg in args]
+    return hashlib.sha256(repr((kind, normalized)).encode("utf-8")).hexdigest()
+
+
+def _chain(source, target):
+    # Resolve ``target`` with the outcome of ``source``
+    def copy(done):
+        if done.exception() is not None:
+            target.set_exception(done.exception())
+        else:
+            target.set_result(done.result())
+    source.add_done_callback(copy)
+
+
+class SubmissionGate:
+    """Dedup, debounce, per-session rate limits and backpressure for one store."""
+
+    def __init__(self, store, dedup_window=DEDUP_WINDOW, debounce=DEBOUNCE, rate=RATE_LIMIT,
+                 per=RATE_PERIOD, high_water=0.8, max_overflow=1000, clock=time.monotonic):
+        self.store = store
+        self.dedup_window = dedup_window
+        self.debounce = debounce
+        self.rate = rate
+        self.per = per
+        # An unbounded store queue (max_pending <= 0) is never saturated
+        self.high_water = int(store.max_pending * high_water) if store.max_pending > 0 else float("inf")
+        self.max_overflow = max_overflow
+        self._clock = clock
+        self._writers = {
+            "commitments": store.submit_commitment,
+            "audits": store.submit_audit,
+            "case_responses": store.submit_case_response,
+        }
+        self._lock = threading.Lock()
+        self._recent = OrderedDict()    # (session, digest) -> (time, future), oldest first
+        self._sessions = OrderedDict()  # session -> [tokens, refill time, {kind: last time}]
+        self._overflow = deque()
+        self._wakeup = threading.Event()
+        self._drainer = threading.Thread(target=self._run_drainer, name="submission-overflow",
+                                         daemon=True)
+        self._drainer.start()
+
+    def saturated(self):
+        return bool(self._overflow) or self.store.pending() >= self.high_water
+
+    def submit(self, session_id, kind, *args):
+        """Admit ``store.submit_<kind>(*args)`` for ``session_id``; returns an ``Admission``."""
+        if kind not in self._writers:
+            raise ValueError(f"unknown submission kind: {kind!r}")
+        key = (session_id, content_hash(kind, args))
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            recent = self._recent.get(key)
+            if recent is not None and recent[1].done() and recent[1].exception() is not None:
+                # The earlier copy was never stored, so this one isn't a duplicate
+                del self._recent[key]
+                recent = None
+            if recent is not None:
+                return self._decide(kind, DUPLICATE, recent[1])
+            session = self._session(session_id, now)
+            if now - session[2].get(kind, float("-inf")) < self.debounce:
+                return self._decide(kind, DEBOUNCED)
+            if session[0] < 1:
+                return self._decide(kind, RATE_LIMITED)
+            admission = self._admit(kind, args)
+            if admission.status in STORED:
+                session[0] -= 1
+                session[2][kind] = now
+                self._recent[key] = (now, admission.future)
+            return self._decide(kind, admission.status, admission.future)
+
+    def _decide(self, kind, status, future=None):
+        metrics.inc("workshop_admissions_total", kind=kind, status=status)
+        return Admission(status, future)
+
+    def _admit(self, kind, args):
+        # Called with the lock held; never blocks on the store's queue
+        if not self.saturated():
+            try:
+                return Admission(ACCEPTED, self._writers[kind](*args, timeout=0))
+            except queue.Full:
+                pass
+        if len(self._overflow) >= self.max_overflow:
+            return Admission(BUSY, None)
+        future = Future()
+        self._overflow.append((kind, args, future))
+        self._wakeup.set()
+        return Admission(QUEUED, future)
+
+    def _session(self, session_id, now):
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = [float(self.rate), now, {}]
+        else:
+            self._sessions.move_to_end(session_id)
+            session[0] = min(self.rate, session[0] + (now - session[1]) * self.rate / self.per)
+            session[1] = now
+        return session
+
+    def _expire(self, now):
+        cutoff = now - self.dedup_window
+        while self._recent and next(iter(self._recent.values()))[0] < cutoff:
+            self._recent.popitem(last=False)
+        # A session not refilled for this long has a full bucket and no
+        # debounce left, whatever the dedup window is
+        cutoff = now - max(self.per, self.debounce)
+        while self._sessions and next(iter(self._sessions.values()))[1] < cutoff:
+            self._sessions.popitem(last=False)
+
+    def pending(self):
+        """Submissions waiting in the overflow list."""
+        return len(self._overflow)
+
+    def _run_drainer(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while self._overflow:
+                if self.store.pending() >= self.high_water or not self._drain_one():
+                    time.sleep(self.store.batch_wait)
+
+    def _drain_one(self):
+        with self._lock:
+            kind, args, future = self._overflow[0]
+            try:
+                stored = self._writers[kind](*args, timeout=0)
+            except queue.Full:
+                return False
+            except Exception as exc:
+                future.set_exception(exc)
+            else:
+                _chain(stored, future)
+            self._overflow.popleft()
+            return True
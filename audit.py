@@ -0,0 +1,253 @@
+"""Quick Gender Audit scoring and room-level aggregation.
+
+``score_batch`` scores any number of audits in one vectorized pass and is
+used for both the single slider form and bulk CSV uploads.
+
+Every submission also updates per-category histograms and running means
+and variances (Welford's algorithm) in place, so the facilitator view
+reads a ready-made snapshot instead of rescanning stored submissions.
+Cumulative histograms kept alongside them give percentile ranks against
+all prior submissions with a single array lookup.
+"""
+import itertools
+import threading
+
+import numpy as np
+
+AUDIT_CATEGORIES = ['Leadership', 'Recruitment', 'Environment', 'Work-Life', 'Resources']
+MIN_SCORE = 1
+MAX_SCORE = 5
+
+# Number of lowest-scoring categories recommended as focus areas
+N_FOCUS_AREAS = 2
+
+RECOMMENDATIONS = {
+    'Leadership': [
+        "Establish clear, objective criteria for leadership selection",
+        "Create mentoring programs that connect women with leadership opportunities",
+        "Review decision-making processes for inclusivity",
+    ],
+    'Recruitment': [
+        "Implement blind resume screening where possible",
+        "Train hiring committees on recognizing implicit bias",
+        "Standardize interview questions and evaluation metrics",
+    ],
+    'Environment': [
+        "Develop and enforce clear anti-harassment policies",
+        "Create channels for reporting bias or discrimination",
+        "Provide regular gender sensitivity training",
+    ],
+    'Work-Life': [
+        "Review flexible work policies for accessibility to all genders",
+        "Normalize parental leave for all parents",
+        "Consider caregiving responsibilities in meeting and travel schedules",
+    ],
+    'Resources': [
+        "Audit resource allocation patterns by gender",
+        "Create transparent processes for equipment and funding requests",
+        "Ensure equal access to professional development opportunities",
+    ],
+}
+
+
+def score_batch(scores):
+    """Score an ``(n, 5)`` array of audits in one pass.
+
+    Returns ``(averages, focus)`` where ``averages`` has shape ``(n,)`` and
+    ``focus`` holds the category indices of the ``N_FOCUS_AREAS`` lowest
+    scores per row, lowest first. Ties go to the earlier category, as a
+    stable sort over the categories would.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if scores.ndim != 2 or scores.shape[1] != len(AUDIT_CATEGORIES):
+        raise ValueError(f"expected an (n, {len(AUDIT_CATEGORIES)}) array of scores")
+    averages = scores.mean(axis=1)
+    k = N_FOCUS_AREAS
+    # k-th lowest score per row, found with argpartition (no full sort)
+    kth = np.take_along_axis(scores, np.argpartition(scores, k - 1, axis=1)[:, k - 1:k], axis=1)
+    # Everything below it is selected; ties at it are filled in category order
+    below = scores < kth
+    tied = scores == kth
+    selected = below | (tied & (np.cumsum(tied, axis=1) <= k - below.sum(axis=1, keepdims=True)))
+    focus = np.argsort(~selected, axis=1, kind="stable")[:, :k]
+    order = np.argsort(np.take_along_axis(scores, focus, axis=1), axis=1, kind="stable")
+    return averages, np.take_along_axis(focus, order, axis=1)
+
+
+def score_audit(scores):
+    """Score one audit: ``(average, [(category, score), ...] focus areas)``."""
+    averages, focus = score_batch([scores])
+    return float(averages[0]), [(AUDIT_CATEGORIES[i], scores[i]) for i in focus[0]]
+
+
+def _normalize(name):
+    return "".join(ch for ch in str(name).lower() if ch.isalnum())
+
+
+# Accepted CSV headers per category (compared after _normalize)
+COLUMN_ALIASES = {
+    'Leadership': {"leadership", "leadershipdecisionmaking"},
+    'Recruitment': {"recruitment", "recruitmentpromotion", "recruitmentpromotionpractices"},
+    'Environment': {"environment", "workenvironmentculture", "workenvironment"},
+    'Work-Life': {"worklife", "worklifebalance", "worklifebalancesupport", "balance"},
+    'Resources': {"resources", "resourceallocationopportunities", "resourceallocation"},
+}
+
+
+def score_dataframe(df):
+    """Score a table with one audit per row (e.g. an uploaded CSV).
+
+    The five category columns are matched by name, ignoring case and
+    punctuation; any other columns (department names etc.) are kept.
+    Raises ``ValueError`` with a readable message for missing columns or
+    scores outside 1-5.
+    """
+    columns = {}
+    for column in df.columns:
+        for category, aliases in COLUMN_ALIASES.items():
+            if _normalize(column) in aliases and category not in columns:
+                columns[category] = column
+    missing = [category for category in AUDIT_CATEGORIES if category not in columns]
+    if missing:
+        raise ValueError(f"Missing score column(s): {', '.join(missing)}")
+
+    import pandas as pd
+
+    raw = df[[columns[category] for category in AUDIT_CATEGORIES]]
+    scores = raw.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+    bad = np.isnan(scores) | (scores < MIN_SCORE) | (scores > MAX_SCORE)
+    if bad.any():
+        rows = np.flatnonzero(bad.any(axis=1))
+        shown = ", ".join(str(row + 2) for row in rows[:10])  # +2: header line, 1-based
+        more = f" and {len(rows) - 10} more" if len(rows) > 10 else ""
+        raise ValueError(f"Scores must be numbers from {MIN_SCORE} to {MAX_SCORE}; "
+                         f"check line(s) {shown}{more}")
+
+    averages, focus = score_batch(scores)
+    categories = np.array(AUDIT_CATEGORIES)
+    result = df.copy()
+    result["Overall score"] = averages.round(2)
+    for i in range(N_FOCUS_AREAS):
+        result[f"Focus area {i + 1}"] = categories[focus[:, i]]
+    return result
+
+
+def recommendations_markdown(category):
+    return "\n".join(f"• {item}" for item in RECOMMENDATIONS[category])
+
+
+class AuditAggregator:
+    """Incremental statistics over audit score vectors.
+
+    ``add`` and ``percentiles`` are O(1) in the number of submissions seen
+    so far. Overall scores are tracked by their score total (5-25), which
+    maps one-to-one onto the average.
+    """
+
+    def __init__(self, n_categories=len(AUDIT_CATEGORIES)):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.histograms = np.zeros((n_categories, MAX_SCORE - MIN_SCORE + 1), dtype=np.int64)
+        self.means = np.zeros(n_categories)
+        self._m2 = np.zeros(n_categories)
+        self.overall_mean = 0.0
+        self._overall_m2 = 0.0
+        # Cumulative counts: _cumulative[c, b] = audits with category c scored <= MIN_SCORE + b
+        self._cumulative = np.zeros_like(self.histograms)
+        self.total_histogram = np.zeros(n_categories * (MAX_SCORE - MIN_SCORE) + 1, dtype=np.int64)
+        self._total_cumulative = np.zeros_like(self.total_histogram)
+        self._rows = np.arange(n_categories)
+
+    def add(self, scores):
+        scores = np.asarray(scores, dtype=np.float64)
+        overall = scores.mean()
+        bins = scores.astype(np.int64) - MIN_SCORE
+        total_bin = int(bins.sum())
+        with self._lock:
+            self.count += 1
+            self.histograms[self._rows, bins] += 1
+            self._cumulative += np.arange(self._cumulative.shape[1]) >= bins[:, None]
+            self.total_histogram[total_bin] += 1
+            self._total_cumulative[total_bin:] += 1
+            delta = scores - self.means
+            self.means += delta / self.count
+            self._m2 += delta * (scores - self.means)
+            overall_delta = overall - self.overall_mean
+            self.overall_mean += overall_delta / self.count
+            self._overall_m2 += overall_delta * (overall - self.overall_mean)
+
+    def add_many(self, rows, chunk_size=5000):
+        """Add every score vector in ``rows`` (any iterable), a chunk at a time.
+
+        Each chunk is merged in one vectorized step: histogram counts with
+        ``np.bincount`` and means and M2 with Chan et al.'s pairwise update,
+        so replaying a large store costs a few array operations per chunk.
+        """
+        rows = iter(rows)
+        while True:
+            chunk = np.array(list(itertools.islice(rows, chunk_size)), dtype=np.float64)
+            if not len(chunk):
+                return
+            self._add_batch(chunk)
+
+    def _add_batch(self, scores):
+        n_categories, n_bins = self.histograms.shape
+        if scores.ndim != 2 or scores.shape[1] != n_categories:
+            raise ValueError(f"expected an (n, {n_categories}) array of scores")
+        m = len(scores)
+        bins = scores.astype(np.int64) - MIN_SCORE
+        histograms = np.bincount((bins + self._rows * n_bins).ravel(),
+                                 minlength=n_categories * n_bins).reshape(n_categories, n_bins)
+        total_histogram = np.bincount(bins.sum(axis=1), minlength=len(self.total_histogram))
+        overall = scores.mean(axis=1)
+        means = scores.mean(axis=0)
+        m2 = ((scores - means) ** 2).sum(axis=0)
+        overall_mean = overall.mean()
+        overall_m2 = float(((overall - overall_mean) ** 2).sum())
+        with self._lock:
+            n = self.count + m
+            self.histograms += histograms
+            self._cumulative += np.cumsum(histograms, axis=1)
+            self.total_histogram += total_histogram
+            self._total_cumulative += np.cumsum(total_histogram)
+            delta = means - self.means
+            self._m2 += m2 + delta ** 2 * self.count * m / n
+            self.means += delta * m / n
+            overall_delta = overall_mean - self.overall_mean
+            self._overall_m2 += overall_m2 + overall_delta ** 2 * self.count * m / n
+            self.overall_mean += overall_delta * m / n
+            self.count = n
+
+    def percentiles(self, scores):
+        """Percentile ranks of an audit against every audit recorded so far.
+
+        Returns ``(overall, per_category)`` in percent, using the mid-rank
+        definition (ties count half), or ``None`` before any audit exists.
+        """
+        bins = np.asarray(scores, dtype=np.int64) - MIN_SCORE
+        total_bin = int(bins.sum())
+        with self._lock:
+            n = self.count
+            if not n:
+                return None
+            below = np.where(bins > 0, self._cumulative[self._rows, bins - 1], 0)
+            equal = self.histograms[self._rows, bins]
+            total_below = self._total_cumulative[total_bin - 1] if total_bin > 0 else 0
+            total_equal = self.total_histogram[total_bin]
+        per_category = 100.0 * (below + 0.5 * equal) / n
+        overall = 100.0 * (total_below + 0.5 * total_equal) / n
+        return float(overall), per_category
+
+    def snapshot(self):
+        """Copy of the current statistics, safe to use outside the lock."""
+        with self._lock:
+            n = self.count
+            variances = self._m2 / (n - 1) if n > 1 else np.zeros_like(self._m2)
+            return {
+                "count": n,
+                "histograms": self.histograms.copy(),
+                "means": self.means.copy(),
+                "variances": variances,
+                "overall_mean": self.overall_mean,
+                "overall_variance": self._overall_m2 / (n - 1) if n > 1 else 0.0,
+            }
@@ -0,0 +1,234 @@
+"""Multi-session load test for streamlit_app.py.
+
+Drives N simulated participants through each page with Streamlit's
+AppTest and reports rerun latency percentiles, throughput and peak RSS
+per page.
+
+AppTest drives one script run at a time per process, so the sessions of a
+worker process take turns (round-robin, one scenario per turn) while
+sharing that process's caches and database connections, the same way
+sessions share a Streamlit server. ``--workers`` adds real parallelism by
+spreading sessions over several processes writing to the same database.
+
+    python benchmarks/load.py --sessions 20 --workers 4 --json results.json
+    python benchmarks/load.py --compare results.json   # diff against an earlier run
+
+Results carry the git commit they were measured on, so JSON files from
+different commits can be compared with ``--compare``.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "streamlit_app.py")
+
+RELAXED_ADMISSION = {
+    "WORKSHOP_DEDUP_WINDOW": "0",
+    "WORKSHOP_DEBOUNCE": "0",
+    "WORKSHOP_RATE_LIMIT": "1000000",
+}
+
+DEFAULT_PAGES = ["Introduction", "Case Studies Explorer", "Quick Gender Audit", "Commitment Wall"]
+ALL_PAGES = DEFAULT_PAGES + ["Facilitator Dashboard"]
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+class PeakRSS:
+    """Samples this process's RSS on a background thread and keeps the peak."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_mb())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_mb())
+
+
+def _button(at, label):
+    return next(button for button in at.button if button.label == label)
+
+
+def _timed(at, latencies, action=None):
+    start = time.perf_counter()
+    (action or at.run)()
+    latencies.append(time.perf_counter() - start)
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+# One scenario per page. Each gets a session that is already on its page and
+# appends the latency of every rerun it triggers.
+
+def introduction(at, rng, latencies):
+    for i in rng.sample(range(6), 3):
+        _timed(at, latencies, at.checkbox[i].check().run)
+    _timed(at, latencies, at.checkbox[rng.randrange(6)].uncheck().run)
+
+
+def case_studies(at, rng, latencies):
+    case = rng.choice(at.selectbox[0].options)
+    _timed(at, latencies, at.selectbox[0].set_value(case).run)
+    at.text_area[0].input(f"Insight {rng.random()}")
+    at.text_area[1].input(f"Solution {rng.random()}")
+    _timed(at, latencies, _button(at, "Share with Workshop").click().run)
+
+
+def quick_gender_audit(at, rng, latencies):
+    for slider in at.slider:
+        slider.set_value(rng.randint(1, 5))
+    _timed(at, latencies, _button(at, "See Results").click().run)
+
+
+def commitment_wall(at, rng, latencies):
+    at.text_input[0].input(f"Participant {rng.randrange(10000)}")
+    at.text_input[1].input(rng.choice(["Entomology", "Vector Biology", "Human Resources"]))
+    at.text_area[0].input(f"I commit to benchmark {rng.random()}")
+    _timed(at, latencies, _button(at, "Add My Commitment").click().run)
+
+
+def facilitator_dashboard(at, rng, latencies):
+    _timed(at, latencies)
+
+
+SCENARIOS = {
+    "Introduction": introduction,
+    "Case Studies Explorer": case_studies,
+    "Quick Gender Audit": quick_gender_audit,
+    "Commitment Wall": commitment_wall,
+    "Facilitator Dashboard": facilitator_dashboard,
+}
+
+
+def run_worker(page, sessions, iterations, seed):
+    """Run ``sessions`` interleaved sessions in this process."""
+    from streamlit.testing.v1 import AppTest
+
+    latencies = []
+    with PeakRSS() as rss:
+        apps = []
+        for i in range(sessions):
+            at = AppTest.from_file(APP, default_timeout=120)
+            at.session_state["page"] = page
+            at.session_state["facilitator_unlocked"] = True  # measure the dashboard itself
+            _timed(at, latencies)
+            apps.append((at, random.Random(seed + i)))
+        for _ in range(iterations):
+            for at, rng in apps:
+                SCENARIOS[page](at, rng, latencies)
+    return latencies, rss.peak
+
+
+def run_page(page, sessions, iterations, seed, workers):
+    shares = [sessions // workers + (i < sessions % workers) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(run_worker, page, share, iterations, seed + 1000 * i)
+                   for i, share in enumerate(shares) if share]
+        outcomes = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+    latencies = np.concatenate([outcome[0] for outcome in outcomes])
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        "page": page,
+        "sessions": sessions,
+        "workers": len(outcomes),
+        "reruns": int(latencies.size),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "throughput_rps": round(latencies.size / elapsed, 2),
+        "peak_rss_mb": round(max(outcome[1] for outcome in outcomes), 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    base = {row["page"]: row for row in baseline["pages"]} if baseline else {}
+    print(f"{'page':<24}{'reruns':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'rerun/s':>9}{'peak MiB':>10}")
+    for row in results["pages"]:
+        print(f"{row['page']:<24}{row['reruns']:>7}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+              f"{row['p99_ms']:>9.1f}{row['throughput_rps']:>9.1f}{row['peak_rss_mb']:>10.1f}")
+        old = base.get(row["page"])
+        if old:
+            deltas = [f"{key} {100 * (row[key] - old[key]) / old[key]:+.0f}%"
+                      for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps") if old[key]]
+            print(f"{'':<24}vs {baseline.get('commit') or 'baseline'}: {', '.join(deltas)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=10, help="simulated sessions per page")
+    parser.add_argument("--workers", type=int, default=1, help="processes to spread sessions over")
+    parser.add_argument("--iterations", type=int, default=3, help="scenario repetitions per session")
+    parser.add_argument("--pages", nargs="+", choices=ALL_PAGES, default=DEFAULT_PAGES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write machine-readable results to this file")
+    parser.add_argument("--compare", help="earlier --json results to compare against")
+    args = parser.parse_args()
+
+    # Submissions go to a throwaway database, never the workshop's own
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["WORKSHOP_DB_PATH"] = os.path.join(tmp.name, "load.db")
+    # Simulated sessions resubmit far faster than people do; relax the
+    # admission gate so the write path is timed, not the rejection rerun
+    os.environ.update(RELAXED_ADMISSION)
+
+    results = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "sessions": args.sessions,
+        "workers": args.workers,
+        "iterations": args.iterations,
+        "pages": [run_page(page, args.sessions, args.iterations, args.seed, args.workers)
+                  for page in args.pages],
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
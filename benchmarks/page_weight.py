@@ -0,0 +1,112 @@
+"""Bytes sent to the browser per page, in normal and low-bandwidth mode.
+
+Each page is run once with Streamlit's AppTest (the Quick Gender Audit with
+its results shown). The page weight is the serialized size of every
+element the script sends plus the media files (chart images) it
+references, which the browser downloads separately.
+
+    python benchmarks/page_weight.py
+    python benchmarks/page_weight.py --json weight.json
+
+Streamlit sends these messages uncompressed by default, so this is close
+to what a participant downloads per rerun, apart from the one-off
+JavaScript bundle.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "streamlit_app.py")
+
+PAGES = ["Introduction", "Case Studies Explorer", "Quick Gender Audit", "Commitment Wall",
+         "Facilitator Dashboard"]
+
+
+def _elements(node):
+    children = getattr(node, "children", None)
+    if children is None:
+        yield node
+        return
+    for child in children.values():
+        yield from _elements(child)
+
+
+# Sizes of the media files added during the current run, by file id. AppTest
+# discards its media storage after each run, so sizes are noted on the way in.
+_media_sizes = {}
+
+
+def _record_media():
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    load = MemoryMediaFileStorage.load_and_get_id
+
+    def load_and_record(self, path_or_data, *args, **kwargs):
+        file_id = load(self, path_or_data, *args, **kwargs)
+        _media_sizes[file_id] = len(self._files_by_id[file_id].content)
+        return file_id
+
+    MemoryMediaFileStorage.load_and_get_id = load_and_record
+
+
+def page_weight(page, low_bandwidth):
+    """``(element bytes, media bytes)`` for one run of ``page``."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.session_state["page"] = page
+    at.session_state["facilitator_unlocked"] = True  # measure the dashboard itself
+    at.session_state["low_bandwidth"] = low_bandwidth
+    at.run()
+    if page == "Quick Gender Audit":
+        _media_sizes.clear()
+        next(button for button in at.button if button.label == "See Results").click().run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+    element_bytes = sum(element.proto.ByteSize() for root in (at.main, at.sidebar)
+                        for element in _elements(root) if getattr(element, "proto", None) is not None)
+    media_bytes = sum(_media_sizes.values())
+    _media_sizes.clear()
+    return element_bytes, media_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", nargs="+", choices=PAGES, default=PAGES)
+    parser.add_argument("--json", help="write machine-readable results to this file")
+    args = parser.parse_args()
+
+    # Never touch the workshop's own database
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["WORKSHOP_DB_PATH"] = os.path.join(tmp.name, "weight.db")
+    sys.path.insert(0, ROOT)
+    _record_media()
+
+    rows = []
+    print(f"{'page':<24}{'normal KiB':>12}{'low-bw KiB':>12}{'ratio':>8}")
+    for page in args.pages:
+        normal = page_weight(page, False)
+        lite = page_weight(page, True)
+        row = {
+            "page": page,
+            "normal_bytes": sum(normal),
+            "normal_media_bytes": normal[1],
+            "low_bandwidth_bytes": sum(lite),
+            "low_bandwidth_media_bytes": lite[1],
+        }
+        rows.append(row)
+        ratio = row["normal_bytes"] / row["low_bandwidth_bytes"]
+        print(f"{page:<24}{row['normal_bytes'] / 1024:>12.1f}{row['low_bandwidth_bytes'] / 1024:>12.1f}"
+              f"{ratio:>7.1f}x")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"pages": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
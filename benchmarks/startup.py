@@ -0,0 +1,123 @@
+"""Cold-start benchmark for streamlit_app.py.
+
+Each page is opened as the first run of a fresh Python process, and the
+script reports how long that run took, how much RSS it added and which
+heavy modules it pulled in. The standalone import cost of each heavy
+module is measured the same way, in its own process.
+
+    python benchmarks/startup.py [--json results.json]
+
+Streamlit itself imports NumPy while running some elements, so NumPy can
+show up as loaded on pages that never use it directly.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "streamlit_app.py")
+
+PAGES = ["Introduction", "Case Studies Explorer", "Quick Gender Audit", "Commitment Wall",
+         "Facilitator Dashboard"]
+HEAVY_MODULES = ["matplotlib", "numpy", "pandas"]
+
+
+def rss_mb():
+    """Current resident set size of this process in MiB (Linux)."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def measure_page(page):
+    """Child process: open ``page`` on the first run and report the cost."""
+    from streamlit.testing.v1 import AppTest
+
+    preloaded = {name for name in HEAVY_MODULES if name in sys.modules}
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.session_state["page"] = page
+    at.session_state["facilitator_unlocked"] = True  # measure the dashboard itself
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+    return {
+        "page": page,
+        "first_run_s": round(elapsed, 4),
+        "rss_before_mb": round(rss_before, 1),
+        "rss_after_mb": round(rss_mb(), 1),
+        "rss_added_mb": round(rss_mb() - rss_before, 1),
+        "loaded_modules": sorted(name for name in HEAVY_MODULES
+                                 if name in sys.modules and name not in preloaded),
+        "preloaded_modules": sorted(preloaded),
+    }
+
+
+def measure_import(module):
+    """Child process: import ``module`` into an otherwise empty interpreter."""
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    __import__(module)
+    return {
+        "module": module,
+        "import_s": round(time.perf_counter() - start, 4),
+        "rss_added_mb": round(rss_mb() - rss_before, 1),
+    }
+
+
+def run_child(*args):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, WORKSHOP_DB_PATH=os.path.join(tmp, "bench.db"))
+        out = subprocess.run([sys.executable, __file__, *args], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--json", help="write machine-readable results to this file")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh processes per page (best run is kept)")
+    parser.add_argument("--child-page", help=argparse.SUPPRESS)
+    parser.add_argument("--child-import", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child_page:
+        print(json.dumps(measure_page(args.child_page)))
+        return
+    if args.child_import:
+        print(json.dumps(measure_import(args.child_import)))
+        return
+
+    pages = []
+    for page in PAGES:
+        runs = [run_child("--child-page", page) for _ in range(args.repeat)]
+        pages.append(min(runs, key=lambda run: run["first_run_s"]))
+    imports = []
+    for module in HEAVY_MODULES:
+        runs = [run_child("--child-import", module) for _ in range(args.repeat)]
+        imports.append(min(runs, key=lambda run: run["import_s"]))
+
+    print(f"{'page':<24}{'first run (s)':>14}{'RSS added (MiB)':>17}  loaded")
+    for result in pages:
+        print(f"{result['page']:<24}{result['first_run_s']:>14.3f}{result['rss_added_mb']:>17.1f}  "
+              f"{', '.join(result['loaded_modules']) or '-'}")
+    print()
+    print(f"{'module':<24}{'import (s)':>14}{'RSS added (MiB)':>17}")
+    for result in imports:
+        print(f"{result['module']:<24}{result['import_s']:>14.3f}{result['rss_added_mb']:>17.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version.split()[0], "pages": pages, "imports": imports}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
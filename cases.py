@@ -0,0 +1,103 @@
+"""Case study registry for the Case Studies Explorer.
+
+Cases live as JSON files in ``case_studies/`` (one case per file, sorted by
+file name). The registry loads them once per process and keeps an inverted
+index over each case's scenario, questions and key issues for keyword
+search.
+"""
+import json
+import os
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from html import escape
+
+CASES_DIR = os.environ.get(
+    "WORKSHOP_CASES_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "case_studies"),
+)
+
+SEARCH_FIELDS = ("scenario", "questions", "key_issues")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lower-case word tokens, with a trailing possessive "s" dropped."""
+    return _TOKEN_RE.findall(text.lower().replace("'s", ""))
+
+
+class CaseRegistry:
+    """Read-only collection of case studies with a keyword index.
+
+    ``search`` matches every query token as a prefix of an indexed term, so
+    "negotiat" finds both "negotiation" and "negotiated".
+    """
+
+    def __init__(self, cases):
+        self._cases = {case["title"]: case for case in cases}
+        self._index = defaultdict(dict)
+        for title, case in self._cases.items():
+            for field in SEARCH_FIELDS:
+                value = case[field]
+                text = value if isinstance(value, str) else " ".join(value)
+                for token in tokenize(text):
+                    self._index[token][title] = self._index[token].get(title, 0) + 1
+        self._terms = sorted(self._index)
+
+    @classmethod
+    def from_directory(cls, path=CASES_DIR):
+        cases = []
+        for filename in sorted(os.listdir(path)):
+            if filename.endswith(".json"):
+                with open(os.path.join(path, filename), encoding="utf-8") as f:
+                    cases.append(json.load(f))
+        return cls(cases)
+
+    def __len__(self):
+        return len(self._cases)
+
+    def __getitem__(self, title):
+        return self._cases[title]
+
+    def titles(self):
+        return list(self._cases)
+
+    def _postings(self, token):
+        # Terms are sorted, so all terms starting with ``token`` are adjacent
+        postings = defaultdict(int)
+        i = bisect_left(self._terms, token)
+        while i < len(self._terms) and self._terms[i].startswith(token):
+            for title, count in self._index[self._terms[i]].items():
+                postings[title] += count
+            i += 1
+        return postings
+
+    def search(self, query):
+        """Titles of cases matching every word of ``query``, best match first."""
+        tokens = tokenize(query)
+        if not tokens:
+            return self.titles()
+        scores = None
+        for token in tokens:
+            postings = self._postings(token)
+            if scores is None:
+                scores = dict(postings)
+            else:
+                scores = {title: scores[title] + count
+                          for title, count in postings.items() if title in scores}
+            if not scores:
+                return []
+        order = {title: i for i, title in enumerate(self._cases)}
+        return sorted(scores, key=lambda title: (-scores[title], order[title]))
+
+
+def render_responses(responses):
+    """Render shared group responses as a single HTML block."""
+    return "".join(
+        "<div class='response-box'>"
+        f"<p><strong>Key insights</strong>: {escape(response['group_insights'])}</p>"
+        f"<p><strong>Proposed solutions</strong>: {escape(response['proposed_solutions'])}</p>"
+        "</div>"
+        for response in responses
+    )
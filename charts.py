@@ -0,0 +1,336 @@
+"""Chart rendering helpers for the workshop app.
+
+Charts are drawn with matplotlib's object-oriented ``Figure`` API on the
+Agg canvas, never through pyplot's global state, so several can render at
+once. Renders run on a small bounded worker pool and callers wait for the
+image bytes with a timeout, so a slow render can't hold up a rerun
+indefinitely.
+
+Static charts are rendered once per process and served from memory as
+image bytes, so reruns never rebuild a matplotlib figure. Audit result
+charts only depend on five 1-5 scores, so they are kept in a bounded LRU
+cache keyed by the score tuple.
+"""
+import io
+import itertools
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import matplotlib
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import metrics
+from audit import AUDIT_CATEGORIES
+from content import (REPRESENTATION_GAP_COLORS, REPRESENTATION_GAP_LABELS,
+                     REPRESENTATION_GAP_SERIES, REPRESENTATION_GAP_TITLE)
+
+# Same output settings st.pyplot uses, so cached images look identical
+SAVEFIG_KWARGS = {"dpi": 200, "bbox_inches": "tight"}
+
+# SVGs keep their text as text instead of glyph outlines (about 5x smaller)
+# and carry no creation date, so the same chart always has the same bytes
+matplotlib.rcParams["svg.fonttype"] = "none"
+SVG_METADATA = {"Date": None, "Creator": None}
+
+RENDER_WORKERS = int(os.environ.get("WORKSHOP_RENDER_WORKERS", "2"))
+RENDER_TIMEOUT = float(os.environ.get("WORKSHOP_RENDER_TIMEOUT", "10"))
+MAX_QUEUED_RENDERS = int(os.environ.get("WORKSHOP_MAX_QUEUED_RENDERS", "64"))
+
+
+class RenderTimeout(Exception):
+    """A chart was not ready in time (or the render queue was full)."""
+
+
+def new_figure(figsize):
+    """A standalone Figure on an Agg canvas, independent of pyplot."""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def figure_to_bytes(fig, fmt="png"):
+    """Serialize a figure to PNG or SVG bytes."""
+    buf = io.BytesIO()
+    metadata = SVG_METADATA if fmt == "svg" else None
+    fig.savefig(buf, format=fmt, metadata=metadata, **SAVEFIG_KWARGS)
+    return buf.getvalue()
+
+
+def render_figure(draw, *args, fmt="png"):
+    """Call ``draw(*args)`` and return the resulting figure as image bytes."""
+    with metrics.timer("workshop_chart_render_seconds", chart=draw.__name__):
+        return figure_to_bytes(draw(*args), fmt)
+
+
+class RenderPool:
+    """Bounded thread pool for chart renders.
+
+    At most ``max_queued`` renders may be queued or running; beyond that,
+    ``submit`` raises ``RenderTimeout`` instead of letting the backlog grow.
+    """
+
+    def __init__(self, workers=RENDER_WORKERS, max_queued=MAX_QUEUED_RENDERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chart-render")
+        self._slots = threading.BoundedSemaphore(max_queued)
+
+    def submit(self, draw, *args, fmt="png"):
+        """Start rendering ``draw(*args)``; returns a Future of the image bytes."""
+        if not self._slots.acquire(blocking=False):
+            raise RenderTimeout("too many charts are being rendered")
+        try:
+            future = self._executor.submit(render_figure, draw, *args, fmt=fmt)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+
+render_pool = RenderPool()
+
+
+def _wait(future, timeout):
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        raise RenderTimeout(f"chart not ready after {timeout:g}s") from None
+
+
+_static_lock = threading.Lock()
+_static_cache = {}
+_static_inflight = {}
+
+
+def render_static(key, draw, fmt="png", timeout=RENDER_TIMEOUT):
+    """Return cached image bytes for a static chart, rendering it on first use.
+
+    ``draw`` takes no arguments and returns a matplotlib Figure. It is only
+    called once per ``(key, fmt)`` for the lifetime of the process; sessions
+    asking while it renders wait on the same render. Raises
+    ``RenderTimeout`` if the image isn't ready within ``timeout`` seconds
+    (the render still finishes and is cached for the next rerun).
+    """
+    cache_key = (key, fmt)
+    data = _static_cache.get(cache_key)
+    if data is not None:
+        return data
+    with _static_lock:
+        data = _static_cache.get(cache_key)
+        if data is not None:
+            return data
+        future = _static_inflight.get(cache_key)
+        new = future is None
+        if new:
+            future = render_pool.submit(draw, fmt=fmt)
+            _static_inflight[cache_key] = future
+    if new:
+        # Outside the lock: a finished future runs the callback right here
+        future.add_done_callback(lambda f: _finish_static(cache_key, f))
+    return _wait(future, timeout)
+
+
+def _finish_static(cache_key, future):
+    with _static_lock:
+        _static_inflight.pop(cache_key, None)
+        if future.exception() is None:
+            _static_cache[cache_key] = future.result()
+
+
+def clear_static_cache():
+    """Drop all cached static charts (e.g. after changing chart data)."""
+    with _static_lock:
+        _static_cache.clear()
+
+
+def draw_representation_gap():
+    """Build the Introduction page's "Gender Representation Gap" chart."""
+    fig = new_figure((8, 6))
+    ax = fig.subplots()
+    x = np.arange(len(REPRESENTATION_GAP_LABELS))
+    width = 0.35
+
+    (leadership_label, leadership), (researchers_label, researchers) = REPRESENTATION_GAP_SERIES.items()
+    ax.bar(x - width/2, leadership, width, label=leadership_label, color=REPRESENTATION_GAP_COLORS[0])
+    ax.bar(x + width/2, researchers, width, label=researchers_label, color=REPRESENTATION_GAP_COLORS[1])
+
+    ax.set_ylabel('Percentage')
+    ax.set_title(REPRESENTATION_GAP_TITLE)
+    ax.set_xticks(x)
+    ax.set_xticklabels(REPRESENTATION_GAP_LABELS)
+    ax.legend()
+    return fig
+
+
+def representation_gap_chart(fmt="png"):
+    """Cached image bytes of the representation gap chart."""
+    return render_static("representation_gap", draw_representation_gap, fmt=fmt)
+
+
+AUDIT_COLORS = ['#1976D2', '#2E7D32', '#7B1FA2', '#C62828', '#F57F17']
+
+
+def draw_audit_chart(scores):
+    """Build the "Gender-Responsiveness by Category" bar chart."""
+    fig = new_figure((10, 6))
+    ax = fig.subplots()
+    bars = ax.bar(AUDIT_CATEGORIES, scores, color=AUDIT_COLORS)
+
+    # Add a horizontal line for the average
+    ax.axhline(y=3, color='gray', linestyle='--', alpha=0.7)
+
+    # Customize the chart
+    ax.set_ylim(0, 5.5)
+    ax.set_ylabel('Score (1-5)')
+    ax.set_title('Gender-Responsiveness by Category')
+
+    # Add value labels
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+                f'{height:g}',
+                ha='center', va='bottom')
+    return fig
+
+
+class ChartCache:
+    """Thread-safe LRU cache of rendered chart bytes with a byte budget.
+
+    On a miss, ``draw(key)`` is rendered on the render pool; concurrent
+    misses for the same key share one render. Entries are evicted
+    least-recently-used first until the total size of the cached images
+    fits in ``max_bytes``.
+    """
+
+    def __init__(self, draw, max_bytes=32 * 1024 * 1024, name="chart", pool=render_pool):
+        self._draw = draw
+        self._pool = pool
+        self.name = name
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, timeout=RENDER_TIMEOUT):
+        """Return image bytes for ``key``, rendering them on a miss.
+
+        Raises ``RenderTimeout`` if a render takes longer than ``timeout``
+        seconds; it keeps running and lands in the cache when done.
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                metrics.inc("workshop_chart_cache_total", cache=self.name, result="hit")
+                return data
+            self.misses += 1
+            future, new = self._render(key)
+        if new:
+            self._watch(key, future)
+        metrics.inc("workshop_chart_cache_total", cache=self.name, result="miss")
+        return _wait(future, timeout)
+
+    def _render(self, key):
+        # Called with the lock held; returns ``(future, new)``. The caller
+        # passes a new future to ``_watch`` once the lock is released.
+        future = self._inflight.get(key)
+        if future is not None:
+            return future, False
+        future = self._inflight[key] = self._pool.submit(self._draw, key)
+        return future, True
+
+    def _watch(self, key, future):
+        # Never called with the lock held: a future that has already
+        # finished runs the callback in this thread, and _finish takes the lock
+        future.add_done_callback(lambda f: self._finish(key, f))
+
+    def _finish(self, key, future):
+        with self._lock:
+            self._inflight.pop(key, None)
+        if future.exception() is None:
+            self._store(key, future.result())
+
+    def _store(self, key, data):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size_bytes -= len(old)
+            if len(data) > self.max_bytes:
+                return
+            self._entries[key] = data
+            self.size_bytes += len(data)
+            while self.size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+                self.evictions += 1
+
+    def warm(self, keys):
+        """Pre-render ``keys`` that are not cached yet, one at a time.
+
+        Each render is waited for before the next is queued, so warm-up
+        holds at most one slot of the shared pool and a live miss never
+        queues behind a whole batch of warm-up renders.
+        """
+        for key in keys:
+            with self._lock:
+                if key in self._entries:
+                    continue
+                try:
+                    future, new = self._render(key)
+                except RenderTimeout:
+                    return  # Pool is busy with real traffic; stop warming
+                except RuntimeError:
+                    return  # Pool shut down at interpreter exit
+            if new:
+                self._watch(key, future)
+            future.exception()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self.size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+audit_chart_cache = ChartCache(draw_audit_chart, name="audit")
+
+
+def audit_chart(scores, timeout=RENDER_TIMEOUT):
+    """Return PNG bytes of the audit chart for a sequence of five scores."""
+    return audit_chart_cache.get(tuple(int(s) for s in scores), timeout)
+
+
+def common_audit_tuples(default=3):
+    """The slider defaults plus every single-slider change away from them."""
+    base = (default,) * len(AUDIT_CATEGORIES)
+    tuples = [base]
+    for i, value in itertools.product(range(len(base)), range(1, 6)):
+        if value != default:
+            tuples.append(base[:i] + (value,) + base[i + 1:])
+    return tuples
+
+
+def warm_audit_charts(tuples=None, background=True):
+    """Pre-render common audit charts, by default on a daemon thread."""
+    tuples = common_audit_tuples() if tuples is None else tuples
+    if not background:
+        audit_chart_cache.warm(tuples)
+        return None
+    thread = threading.Thread(target=audit_chart_cache.warm, args=(tuples,),
+                              name="audit-chart-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,123 @@
+"""Static page content shared by the live app and the static export.
+
+Text that never changes between reruns lives here once, so the Streamlit
+script and ``export_static.py`` render exactly the same words.
+"""
+import re
+
+APP_CSS = """
+    .main-header {
+        font-size: 2.3rem;
+        color: #2E7D32;
+        text-align: center;
+        margin-bottom: 20px;
+    }
+    .section-header {
+        font-size: 1.5rem;
+        color: #1565C0;
+        margin-top: 25px;
+        margin-bottom: 15px;
+    }
+    .case-box {
+        background-color: #E3F2FD;
+        padding: 15px;
+        border-radius: 10px;
+        margin-bottom: 15px;
+        border-left: 5px solid #1565C0;
+    }
+    .response-box {
+        background-color: #FFFDE7;
+        padding: 15px;
+        border-radius: 10px;
+        margin-top: 15px;
+        border-left: 5px solid #FBC02D;
+    }
+    .info-box {
+        background-color: #E8F5E9;
+        padding: 15px;
+        border-radius: 10px;
+        margin-bottom: 15px;
+    }
+    .footer {
+        font-size: 0.8rem;
+        color: #757575;
+        text-align: center;
+        margin-top: 50px;
+    }
+"""
+
+
+
+def minify_css(css):
+    """Drop comments, indentation and blank space around punctuation."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+# Sent with every rerun, so the app uses the minified form
+APP_CSS_MIN = minify_css(APP_CSS)
+
+INTRO_TITLE = "Gender-Responsive Workplaces"
+
+INTRO_DEFINITION_HEADER = "What is a Gender-Responsive Workplace?"
+INTRO_DEFINITION = [
+    "Notices the not-usually-visible needs and problems of women employees",
+    "Creates solutions in response to these needs",
+    "Takes steps and actions to implement the created solutions",
+    "Monitors the results in the long term",
+    "Actively endeavors to increase the satisfaction of employees and to remedy complaints",
+]
+INTRO_SOURCE = "A Guide for Gender-Responsive Companies and Institutions"
+
+INTRO_WHY_HEADER = "Why Gender-Responsive Workplaces Matter"
+INTRO_WHY = [
+    "Diverse teams produce more innovative research",
+    "Better problem-solving through varied perspectives",
+    "More comprehensive research design",
+    "Improved community engagement",
+    "Enhanced research relevance for diverse populations",
+]
+
+# Example data for the Introduction chart, drawn either as an image
+# (charts.py) or as hand-built SVG (lite_charts.py) in low-bandwidth mode
+REPRESENTATION_GAP_TITLE = "Gender Representation Gap in Research Organizations"
+REPRESENTATION_GAP_LABELS = ["Male", "Female"]
+REPRESENTATION_GAP_SERIES = {
+    "Leadership Positions": [85, 15],
+    "Researchers": [55, 45],
+}
+REPRESENTATION_GAP_COLORS = ["#1565C0", "#2E7D32"]
+
+INTRO_CHART_CAPTION = "Example data showing the gender gap between research staff and leadership positions"
+
+# (key, statement, insight shown when it is ticked); keys are also the tally counter names
+REFLECTIONS = [
+    ("reflection1", "I have witnessed gender bias at work",
+     "**Gender bias** can manifest in subtle ways, from who gets called on in meetings to how performance is evaluated."),
+    ("reflection2", "I know someone who was denied a promotion due to gender",
+     "**Promotion barriers** often stem from biased perceptions of leadership abilities and potential."),
+    ("reflection3", "I believe the gender pay gap exists in my organization",
+     "**Pay disparities** persist in many sectors, often beginning with initial salary negotiations and compounding over time."),
+    ("reflection4", "I have felt unheard in a meeting because of my gender",
+     "**Being unheard** in meetings is a common experience, especially for women and those from marginalized groups."),
+    ("reflection5", "I think flexible work policies are applied differently for men and women",
+     "**Flexibility stigma** often affects women more than men, with assumptions about who 'should' use family leave policies."),
+    ("reflection6", "I've observed different standards for mothers vs. fathers at work",
+     "**Parental double standards** remain prevalent, with different expectations for mothers versus fathers in the workplace."),
+]
+
+CASES_TITLE = "Case Studies Explorer"
+CASES_INTRO = (
+    "Explore these real-world-inspired scenarios and discuss potential solutions with your group.\n"
+    "Select a case study to view details and discussion questions."
+)
+
+def intro_definition_markdown():
+    items = "\n".join(f"{i}. {item}" for i, item in enumerate(INTRO_DEFINITION, 1))
+    return f"A gender-responsive workplace:\n\n{items}\n\n*Source: {INTRO_SOURCE}*"
+
+
+def intro_why_markdown():
+    return "\n".join(f"• {item}" for item in INTRO_WHY)
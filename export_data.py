@@ -0,0 +1,117 @@
+"""Streaming CSV/Parquet export of workshop submissions.
+
+Rows are read from the store in fixed-size chunks and written out chunk by
+chunk (one CSV block or one Parquet row group each), so memory use depends
+on the chunk size, not on how many submissions there are.
+
+    python export_data.py commitments --workshop icipe-2025 --format parquet --out commitments.parquet
+"""
+import argparse
+import csv
+import io
+import sys
+
+from storage import CHANGE_KINDS
+from workshops import StoreRegistry, WorkshopDirectory
+
+# Spreadsheet apps treat cells starting with these as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def spreadsheet_safe(value):
+    """Free text with a leading ``'`` if a spreadsheet would run it as a formula."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(store, kind, chunk_size=5000):
+    """Yield the table as UTF-8 CSV byte blocks, header first.
+
+    Text cells are passed through ``spreadsheet_safe``, since these files
+    are opened in spreadsheet apps.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(store.columns(kind))
+    for rows in store.iter_chunks(kind, chunk_size):
+        writer.writerows([spreadsheet_safe(value) for value in row.values()] for row in rows)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def write_csv(store, kind, fileobj, chunk_size=5000):
+    for block in iter_csv(store, kind, chunk_size):
+        fileobj.write(block)
+
+
+def write_parquet(store, kind, fileobj, chunk_size=5000):
+    """Write the table to ``fileobj`` as Parquet, one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = store.columns(kind)
+    writer = None
+    try:
+        for rows in store.iter_chunks(kind, chunk_size):
+            table = pa.Table.from_pylist(rows, schema=writer.schema if writer else None)
+            if writer is None:
+                writer = pq.ParquetWriter(fileobj, table.schema)
+            writer.write_table(table)
+        if writer is None:
+            # No rows yet: still produce a valid file with the right columns
+            empty = pa.Table.from_pydict({column: pa.array([], pa.string()) for column in columns})
+            pq.write_table(empty, fileobj)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def export(store, kind, fmt, fileobj, chunk_size=5000):
+    """Stream every ``kind`` submission into binary ``fileobj`` as ``fmt``."""
+    if fmt == "csv":
+        write_csv(store, kind, fileobj, chunk_size)
+    elif fmt == "parquet":
+        write_parquet(store, kind, fileobj, chunk_size)
+    else:
+        raise ValueError(f"unknown export format: {fmt!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export workshop submissions.")
+    parser.add_argument("kind", choices=CHANGE_KINDS)
+    parser.add_argument("--workshop", help="workshop code (default: the default workshop)")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("--out", help="output file (default: stdout, CSV only)")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    directory = WorkshopDirectory.from_file()
+    try:
+        workshop = directory.resolve(args.workshop or directory.default)
+    except ValueError as exc:
+        parser.error(str(exc))
+    registry = StoreRegistry(directory.default)
+    store = registry.get(workshop)
+    try:
+        if args.out:
+            with open(args.out, "wb") as f:
+                export(store, args.kind, args.format, f, args.chunk_size)
+        elif args.format == "csv":
+            export(store, args.kind, "csv", sys.stdout.buffer, args.chunk_size)
+        else:
+            parser.error("--out is required for Parquet")
+    finally:
+        registry.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Export the read-only pages as a static, pre-compressed HTML bundle.
+
+The Introduction page and every case study are rendered to plain HTML with
+a shared stylesheet and chart images, and each text file gets a gzipped
+twin (``.gz``) next to it. A reverse proxy can then serve these pages
+directly and only forward the interactive pages to Streamlit, e.g. with
+nginx::
+
+    location /workshop/ {
+        alias /srv/static/;          # output of this script
+        gzip_static on;
+    }
+    location /app/ {
+        proxy_pass http://127.0.0.1:8501;
+        proxy_http_version 1.1;      # Streamlit talks over a WebSocket
+        proxy_set_header Upgrade $http_upgrade;
+        proxy_set_header Connection "upgrade";
+        proxy_set_header Host $host;
+        proxy_read_timeout 86400;
+    }
+
+Streamlit must then be started with ``--server.baseUrlPath app`` so its
+own URLs (static files, ``/_stcore/stream``) live under ``/app/`` too.
+
+Usage::
+
+    python export_static.py --out static_site --app-url /app/ --workshop icipe-2025
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+from html import escape
+
+from cases import CaseRegistry
+from content import (APP_CSS, CASES_INTRO, CASES_TITLE, INTRO_CHART_CAPTION,
+                     INTRO_DEFINITION, INTRO_DEFINITION_HEADER, INTRO_SOURCE, INTRO_TITLE,
+                     INTRO_WHY, INTRO_WHY_HEADER)
+from workshops import WorkshopDirectory
+
+COMPRESSIBLE = (".html", ".css", ".svg", ".json")
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} · Gender Responsive Workplace</title>
+<link rel="stylesheet" href="{root}style.css">
+</head>
+<body>
+<nav class="static-nav">
+<a href="{root}index.html">Introduction</a>
+<a href="{root}cases/index.html">Case Studies</a>
+<a href="{app_url}">Interactive workshop</a>
+</nav>
+<main>
+{body}
+</main>
+<hr>
+<div class="footer">{footer}</div>
+</body>
+</html>
+"""
+
+# Layout for the pages outside Streamlit; the workshop styles come from APP_CSS
+STATIC_CSS = """
+body {
+    font-family: "Source Sans Pro", -apple-system, "Segoe UI", sans-serif;
+    line-height: 1.6;
+    color: #31333F;
+    max-width: 60rem;
+    margin: 0 auto;
+    padding: 1rem;
+}
+img { max-width: 100%; height: auto; }
+.static-nav a { margin-right: 1rem; }
+.columns { display: flex; flex-wrap: wrap; gap: 2rem; }
+.columns > div { flex: 1 1 18rem; }
+"""
+
+
+def slugify(title):
+    return re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+
+
+def paragraphs(text):
+    return "".join(f"<p>{escape(part.strip())}</p>" for part in text.split("\n\n") if part.strip())
+
+
+def bullet_list(items, ordered=False):
+    tag = "ol" if ordered else "ul"
+    return f"<{tag}>" + "".join(f"<li>{escape(item)}</li>" for item in items) + f"</{tag}>"
+
+
+def render_page(title, body, app_url, root="", footer_lines=()):
+    footer = "".join(f"<p>{escape(line)}</p>" for line in footer_lines)
+    return PAGE_TEMPLATE.format(title=escape(title), body=body, root=root,
+                                app_url=escape(app_url), footer=footer)
+
+
+def intro_page(app_url, chart_file, footer_lines=()):
+    body = f"""<h1 class="main-header">{escape(INTRO_TITLE)}</h1>
+<div class="columns">
+<div>
+<h2 class="section-header">{escape(INTRO_DEFINITION_HEADER)}</h2>
+<p>A gender-responsive workplace:</p>
+{bullet_list(INTRO_DEFINITION, ordered=True)}
+<p><em>Source: {escape(INTRO_SOURCE)}</em></p>
+<h2 class="section-header">{escape(INTRO_WHY_HEADER)}</h2>
+{bullet_list(INTRO_WHY)}
+</div>
+<div>
+<img src="{chart_file}" alt="Gender Representation Gap in Research Organizations">
+<p><em>{escape(INTRO_CHART_CAPTION)}</em></p>
+</div>
+</div>
+<div class="info-box">
+<p>The reflection exercise is interactive. <a href="{escape(app_url)}">Open the live workshop</a> to take part.</p>
+</div>"""
+    return render_page(INTRO_TITLE, body, app_url, footer_lines=footer_lines)
+
+
+def cases_index_page(registry, app_url, footer_lines=()):
+    links = "".join(f'<li><a href="{slugify(title)}.html">{escape(title)}</a></li>'
+                    for title in registry.titles())
+    body = f"""<h1 class="main-header">{escape(CASES_TITLE)}</h1>
+{paragraphs(CASES_INTRO)}
+<ul>{links}</ul>"""
+    return render_page(CASES_TITLE, body, app_url, root="../", footer_lines=footer_lines)
+
+
+def case_page(case, app_url, footer_lines=()):
+    body = f"""<h1 class="main-header">{escape(case['title'])}</h1>
+<div class="case-box">
+<h3>Scenario</h3>
+{paragraphs(case['scenario'])}
+</div>
+<div class="columns">
+<div><h3>Discussion Questions</h3>{bullet_list(case['questions'])}</div>
+<div><h3>Key Issues to Consider</h3>{bullet_list(case['key_issues'])}</div>
+</div>
+<div class="response-box">
+<p>Ready to share your group's insights? <a href="{escape(app_url)}">Open the live workshop</a>
+and choose this case in the Case Studies Explorer.</p>
+</div>"""
+    return render_page(case["title"], body, app_url, root="../", footer_lines=footer_lines)
+
+
+def write_bundle(out_dir, files):
+    """Write ``{relative path: bytes}`` plus gzip twins; return a manifest."""
+    manifest = {}
+    for rel_path, data in sorted(files.items()):
+        path = os.path.join(out_dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        entry = {"bytes": len(data)}
+        if rel_path.endswith(COMPRESSIBLE):
+            # mtime=0 keeps the output byte-identical between exports
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            with open(path + ".gz", "wb") as f:
+                f.write(compressed)
+            entry["gzip_bytes"] = len(compressed)
+        manifest[rel_path] = entry
+    return manifest
+
+
+def build(out_dir, app_url, registry=None, workshop=None):
+    """Render every static page into ``out_dir``; return the manifest.
+
+    The footer is that of ``workshop`` (default: the default workshop).
+    """
+    from charts import representation_gap_chart
+
+    registry = registry or CaseRegistry.from_directory()
+    directory = WorkshopDirectory.from_file()
+    footer = directory.info(directory.resolve(workshop or directory.default))["footer"]
+    files = {
+        "style.css": (APP_CSS + STATIC_CSS).encode(),
+        "charts/representation_gap.svg": representation_gap_chart(fmt="svg"),
+        "index.html": intro_page(app_url, "charts/representation_gap.svg", footer).encode(),
+        "cases/index.html": cases_index_page(registry, app_url, footer).encode(),
+    }
+    for title in registry.titles():
+        files[f"cases/{slugify(title)}.html"] = case_page(registry[title], app_url, footer).encode()
+
+    manifest = write_bundle(out_dir, files)
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the read-only workshop pages as static HTML.")
+    parser.add_argument("--out", default="static_site", help="output directory")
+    parser.add_argument("--app-url", default="/app/", help="URL of the live Streamlit app")
+    parser.add_argument("--workshop", help="workshop code whose footer to use (default: the default workshop)")
+    args = parser.parse_args()
+
+    manifest = build(args.out, args.app_url, workshop=args.workshop)
+    raw = sum(entry["bytes"] for entry in manifest.values())
+    served = sum(entry.get("gzip_bytes", entry["bytes"]) for entry in manifest.values())
+    print(f"Wrote {len(manifest)} files to {args.out} ({raw / 1024:.1f} KiB, {served / 1024:.1f} KiB gzipped)")
+
+
+if __name__ == "__main__":
+    main()
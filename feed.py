@@ -0,0 +1,53 @@
+"""Incremental live feed for the Facilitator Dashboard.
+
+A ``FeedView`` lives in one session's state. Each refresh asks the store
+only for changes after its cursor and prepends their pre-rendered HTML,
+so refresh cost grows with the number of new items, not the total.
+"""
+from collections import deque
+from html import escape
+
+from cases import render_responses
+from storage import AUDIT_COLUMNS
+from wall import render_commitment
+
+
+def render_item(item):
+    """One change-feed item as an HTML snippet."""
+    kind = item["kind"]
+    if kind == "commitments":
+        return render_commitment(item)
+    if kind == "case_responses":
+        return (f"<p><strong>{escape(item['case_title'])}</strong></p>"
+                + render_responses([item]))
+    if kind == "audits":
+        scores = [item[column] for column in AUDIT_COLUMNS]
+        return (f"<div class='case-box'><p>A Quick Gender Audit was submitted: overall "
+                f"<strong>{sum(scores) / len(scores):.1f}/5</strong></p></div>")
+    return ""
+
+
+class FeedView:
+    """Cursor plus the most recent ``max_items`` rendered items, newest first."""
+
+    def __init__(self, max_items=100):
+        self.max_items = max_items
+        self.cursor = None
+        self.items = deque(maxlen=max_items)
+
+    def refresh(self, store, limit=500):
+        """Fetch and render everything newer than the cursor; return the count."""
+        if self.cursor is None:
+            # Start with the latest ``max_items`` changes instead of the full history
+            self.cursor = max(store.latest_change() - self.max_items, 0)
+        new = 0
+        while True:
+            items, self.cursor = store.changes_since(self.cursor, limit)
+            for item in items:
+                self.items.appendleft(render_item(item))
+            new += len(items)
+            if len(items) < limit:
+                return new
+
+    def html(self):
+        return "".join(self.items)
@@ -0,0 +1,71 @@
+"""Hand-built SVG bar charts for low-bandwidth mode.
+
+A chart here is about 1.5 KB of inline SVG markup, against ~50 KB
+for the matplotlib PNG and ~3 KB for a native Streamlit chart (an Arrow
+table plus a Vega-Lite spec). It is sent inside the page as markdown, so
+there is no extra image request.
+"""
+from html import escape
+
+WIDTH = 400
+HEIGHT = 250
+# Plot area inside the viewBox
+LEFT, RIGHT, TOP, BOTTOM = 34, 392, 40, 216
+
+
+def _num(value):
+    return f"{value:.1f}".rstrip("0").rstrip(".")
+
+
+def bar_chart_svg(categories, series, colors, y_max, title="", ticks=5, reference=None):
+    """Grouped bar chart as an SVG string.
+
+    ``series`` maps a legend name to one value per category. ``colors``
+    has one color per series, or one per category for a single series.
+    ``reference`` draws a dashed horizontal line at that value.
+    """
+    def y(value):
+        return BOTTOM - (BOTTOM - TOP) * value / y_max
+
+    group = (RIGHT - LEFT) / len(categories)
+    bar = group * 0.7 / len(series)
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {HEIGHT}" width="100%" '
+             f'font-family="sans-serif" font-size="11" role="img" aria-label="{escape(title)}">']
+    if title:
+        parts.append(f'<text x="{WIDTH // 2}" y="14" text-anchor="middle" font-size="13">{escape(title)}</text>')
+
+    grid = "".join(f"M{LEFT} {_num(y(y_max * i / ticks))}H{RIGHT}" for i in range(ticks + 1))
+    parts.append(f'<path d="{grid}" stroke="#ddd"/><g text-anchor="end">')
+    parts.extend(f'<text x="{LEFT - 4}" y="{_num(y(y_max * i / ticks) + 4)}">{_num(y_max * i / ticks)}</text>'
+                 for i in range(ticks + 1))
+    parts.append("</g>")
+
+    per_category = len(series) == 1 and len(colors) == len(categories)
+    for s, (name, values) in enumerate(series.items()):
+        parts.append(f'<g fill="{colors[s]}">' if not per_category else "<g>")
+        for c, value in enumerate(values):
+            x = LEFT + group * c + group * 0.15 + bar * s
+            fill = f' fill="{colors[c]}"' if per_category else ""
+            parts.append(f'<rect x="{_num(x)}" y="{_num(y(value))}" width="{_num(bar)}" '
+                         f'height="{_num(BOTTOM - y(value))}"{fill}/>')
+        parts.append('</g><g text-anchor="middle">')
+        parts.extend(f'<text x="{_num(LEFT + group * c + group * 0.15 + bar * (s + 0.5))}" '
+                     f'y="{_num(y(value) - 3)}">{_num(value)}</text>'
+                     for c, value in enumerate(values))
+        parts.append("</g>")
+
+    if reference is not None:
+        parts.append(f'<path d="M{LEFT} {_num(y(reference))}H{RIGHT}" stroke="gray" stroke-dasharray="4"/>')
+
+    parts.append('<g text-anchor="middle">')
+    parts.extend(f'<text x="{_num(LEFT + group * (c + 0.5))}" y="{BOTTOM + 15}">{escape(category)}</text>'
+                 for c, category in enumerate(categories))
+    parts.append("</g>")
+
+    if len(series) > 1:
+        for s, name in enumerate(series):
+            x = LEFT + s * (RIGHT - LEFT) / len(series)
+            parts.append(f'<rect x="{_num(x)}" y="{HEIGHT - 12}" width="10" height="10" fill="{colors[s]}"/>'
+                         f'<text x="{_num(x + 14)}" y="{HEIGHT - 3}">{escape(name)}</text>')
+    parts.append("</svg>")
+    return "".join(parts)
@@ -0,0 +1,206 @@
+"""In-process rerun metrics with Prometheus text export.
+
+Collection is off unless ``WORKSHOP_METRICS`` is set to a true value
+("1", "true", "on", "yes"); when off, every call here is a cheap no-op.
+When on, metrics can be exported by either or both of:
+
+* ``WORKSHOP_METRICS_FILE``: path rewritten every
+  ``WORKSHOP_METRICS_INTERVAL`` seconds (default 15), e.g. for the
+  node_exporter textfile collector.
+* ``WORKSHOP_METRICS_PORT``: serve ``/metrics`` over HTTP on that port.
+"""
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = os.environ.get("WORKSHOP_METRICS", "").lower() in ("1", "true", "on", "yes")
+
+# Latency buckets in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_help = {}
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def describe(name, text):
+    """Set the HELP text exported for metric ``name``."""
+    _help[name] = text
+
+
+def inc(name, amount=1, **labels):
+    """Add ``amount`` to counter ``name`` with the given labels."""
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def observe(name, seconds, **labels):
+    """Record one latency sample in histogram ``name``."""
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [[0] * len(BUCKETS), 0, 0.0]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist[0][i] += 1
+        hist[1] += 1
+        hist[2] += seconds
+
+
+class Timer:
+    """Times a block into histogram ``name``; usable as a context manager
+    or with explicit ``stop()`` when the block can't be indented."""
+
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, **labels):
+        self.name = name
+        self.labels = labels
+        self.start = time.perf_counter()
+
+    def stop(self):
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _NullTimer:
+    def stop(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name, **labels):
+    """Start timing into histogram ``name`` (a no-op when metrics are off)."""
+    if not ENABLED:
+        return _NULL_TIMER
+    return Timer(name, **labels)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def render():
+    """All collected metrics in the Prometheus text exposition format."""
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: (list(b), n, total) for key, (b, n, total) in _histograms.items()}
+    lines = []
+    seen = set()
+    for (name, labels), value in sorted(counters.items()):
+        if name not in seen:
+            seen.add(name)
+            if name in _help:
+                lines.append(f"# HELP {name} {_help[name]}")
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+    for (name, labels), (buckets, count, total) in sorted(histograms.items()):
+        if name not in seen:
+            seen.add(name)
+            if name in _help:
+                lines.append(f"# HELP {name} {_help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+        for bound, bucket_count in zip(BUCKETS, buckets):
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {bucket_count}")
+        lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {total:.6f}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def write_file(path):
+    """Atomically write the current metrics to ``path``."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_exporters():
+    """Start the file writer and/or HTTP endpoint configured in the environment.
+
+    Call once per process. Returns the started threads.
+    """
+    if not ENABLED:
+        return []
+    threads = []
+    path = os.environ.get("WORKSHOP_METRICS_FILE")
+    if path:
+        interval = float(os.environ.get("WORKSHOP_METRICS_INTERVAL", "15"))
+
+        def write_forever():
+            while True:
+                write_file(path)
+                time.sleep(interval)
+
+        threads.append(threading.Thread(target=write_forever, name="metrics-file", daemon=True))
+    port = os.environ.get("WORKSHOP_METRICS_PORT")
+    if port:
+        server = ThreadingHTTPServer(("127.0.0.1", int(port)), _Handler)
+        threads.append(threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True))
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+describe("workshop_page_views_total", "Script runs per page.")
+describe("workshop_page_render_seconds", "Time to run one page branch of the script.")
+describe("workshop_step_seconds", "Time spent in expensive steps within a page.")
+describe("workshop_chart_render_seconds", "Time to draw and encode one matplotlib chart.")
+describe("workshop_chart_cache_total", "Chart cache lookups by result.")
+describe("workshop_submissions_total", "Submissions accepted by kind.")
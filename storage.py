@@ -0,0 +1,411 @@
+"""Durable local storage for workshop submissions.
+
+All writes go through a single background writer thread that drains a
+queue and commits in batches, so many Streamlit sessions submitting at
+once never contend for the SQLite write lock. The database runs in WAL
+mode, which lets every session read while the writer is committing.
+Reads borrow a connection from a small pool owned by the store, shared by
+every session, so the number of open SQLite handles stays fixed however
+many sessions or threads are reading.
+
+Every insert is also recorded in the ``changes`` table under a monotonic
+sequence number, so live views can ask for just what is new since their
+last cursor.
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+DEFAULT_DB_PATH = os.environ.get(
+    "WORKSHOP_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "workshop.db"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commitments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    department TEXT NOT NULL DEFAULT '',
+    commitment_type TEXT NOT NULL,
+    commitment TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS commitments_type ON commitments (commitment_type, id);
+CREATE INDEX IF NOT EXISTS commitments_department ON commitments (department, id);
+CREATE TABLE IF NOT EXISTS audits (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    leadership INTEGER NOT NULL,
+    recruitment INTEGER NOT NULL,
+    environment INTEGER NOT NULL,
+    work_life INTEGER NOT NULL,
+    resources INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS case_responses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    case_title TEXT NOT NULL,
+    group_insights TEXT NOT NULL,
+    proposed_solutions TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS case_responses_case ON case_responses (case_title, id);
+CREATE TABLE IF NOT EXISTS tallies (
+    name TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    item_id INTEGER NOT NULL
+);
+"""
+
+AUDIT_COLUMNS = ("leadership", "recruitment", "environment", "work_life", "resources")
+
+# Kinds of change-feed items, named after the tables they come from
+CHANGE_KINDS = ("commitments", "audits", "case_responses")
+
+_STOP = object()
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
+
+
+class SubmissionStore:
+    """SQLite store with one batching writer thread and a pool of readers.
+
+    ``submit_*`` methods return immediately with a Future that resolves to
+    the new row id once its batch has been committed. The write queue holds
+    at most ``max_pending`` items; past that, ``submit_*`` raises
+    ``queue.Full`` after waiting ``put_timeout`` seconds (or the ``timeout``
+    passed to the call; 0 fails immediately). At most
+    ``max_readers`` read connections are open; further readers wait for one.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=256, batch_wait=0.02,
+                 max_pending=10000, put_timeout=1.0, max_readers=4):
+        self.path = path
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_pending = max_pending
+        self.put_timeout = put_timeout
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._idle_readers = queue.LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(max_readers)
+        self._closed = False
+
+        conn = _connect(path)
+        conn.executescript(SCHEMA)
+        conn.commit()
+        conn.close()
+
+        self._writer = threading.Thread(target=self._run_writer,
+                                        name="submission-writer", daemon=True)
+        self._writer.start()
+
+    # Writes -------------------------------------------------------------
+
+    def _enqueue(self, kind, sql, params, timeout=None):
+        if self._closed:
+            raise RuntimeError("SubmissionStore is closed")
+        future = Future()
+        self._queue.put((kind, sql, params, future),
+                        timeout=self.put_timeout if timeout is None else timeout)
+        return future
+
+    def submit_commitment(self, name, department, commitment_type, commitment, timeout=None):
+        """Queue a commitment for the wall."""
+        return self._enqueue(
+            "commitments",
+            "INSERT INTO commitments (created_at, name, department, commitment_type, commitment) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (time.time(), name or "", department or "", commitment_type, commitment),
+            timeout,
+        )
+
+    def submit_audit(self, scores, timeout=None):
+        """Queue one Quick Gender Audit result (five scores, in category order)."""
+        return self._enqueue(
+            "audits",
+            f"INSERT INTO audits (created_at, {', '.join(AUDIT_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+            (time.time(), *(int(score) for score in scores)),
+            timeout,
+        )
+
+    def submit_case_response(self, case_title, group_insights, proposed_solutions, timeout=None):
+        """Queue a group's "Share with Workshop" response to a case study."""
+        return self._enqueue(
+            "case_responses",
+            "INSERT INTO case_responses (created_at, case_title, group_insights, proposed_solutions) "
+            "VALUES (?, ?, ?, ?)",
+            (time.time(), case_title, group_insights, proposed_solutions),
+            timeout,
+        )
+
+    def add_tallies(self, deltas):
+        """Queue ``{name: delta}`` increments to the anonymous tally counters."""
+        items = list(deltas.items())
+        if not items:
+            raise ValueError("no tally increments to add")
+        return self._enqueue(
+            "tallies",
+            "INSERT INTO tallies (name, count) VALUES " + ", ".join(["(?, ?)"] * len(items))
+            + " ON CONFLICT (name) DO UPDATE SET count = count + excluded.count",
+            tuple(value for item in items for value in item),
+        )
+
+    def pending(self):
+        """Number of writes waiting to be committed."""
+        return self._queue.qsize()
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been committed."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join()
+        while True:
+            try:
+                self._idle_readers.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _next_batch(self):
+        item = self._queue.get()
+        batch = [item]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size and item is not _STOP:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+        return batch
+
+    def _run_writer(self):
+        conn = _connect(self.path)
+        try:
+            while True:
+                batch = self._next_batch()
+                writes = [item for item in batch if isinstance(item, tuple)]
+                if writes:
+                    self._commit(conn, writes)
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+                if _STOP in batch:
+                    return
+        finally:
+            conn.close()
+
+    def _commit(self, conn, writes):
+        try:
+            with conn:
+                ids = [conn.execute(sql, params).lastrowid for _, sql, params, _ in writes]
+                conn.executemany("INSERT INTO changes (kind, item_id) VALUES (?, ?)",
+                                 [(kind, row_id) for (kind, _, _, _), row_id in zip(writes, ids)
+                                  if kind in CHANGE_KINDS])
+        except Exception:
+            # One bad statement rolled back the whole batch; retry the writes
+            # one by one so only the bad ones fail
+            self._commit_each(conn, writes)
+            return
+        for (_, _, _, future), row_id in zip(writes, ids):
+            future.set_result(row_id)
+
+    def _commit_each(self, conn, writes):
+        """Commit ``writes`` in one transaction with a savepoint per write."""
+        outcomes = []
+        try:
+            with conn:
+                # sqlite3 doesn't open a transaction before SAVEPOINT on its
+                # own, and RELEASE of an outermost savepoint commits it
+                conn.execute("BEGIN")
+                for kind, sql, params, _ in writes:
+                    conn.execute("SAVEPOINT write")
+                    try:
+                        row_id = conn.execute(sql, params).lastrowid
+                        if kind in CHANGE_KINDS:
+                            conn.execute("INSERT INTO changes (kind, item_id) VALUES (?, ?)", (kind, row_id))
+                    except Exception as exc:
+                        conn.execute("ROLLBACK TO write")
+                        outcomes.append((None, exc))
+                    else:
+                        outcomes.append((row_id, None))
+                    conn.execute("RELEASE write")
+        except Exception as exc:
+            # The commit itself failed, so nothing in the batch was stored
+            outcomes = [(None, exc)] * len(writes)
+        for (_, _, _, future), (row_id, exc) in zip(writes, outcomes):
+            if exc is None:
+                future.set_result(row_id)
+            else:
+                future.set_exception(exc)
+
+    # Reads --------------------------------------------------------------
+
+    @contextmanager
+    def _reader(self):
+        """Borrow a pooled read connection for the duration of the block."""
+        with self._reader_slots:
+            try:
+                conn = self._idle_readers.get_nowait()
+            except queue.Empty:
+                conn = _connect(self.path)
+            try:
+                yield conn
+            finally:
+                self._idle_readers.put(conn)
+
+    def _query(self, sql, params=()):
+        with self._reader() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def list_commitments(self, limit=20, before_id=None, commitment_type=None, department=None):
+        """Return up to ``limit`` commitments, newest first.
+
+        Pass the ``id`` of the last row of a page as ``before_id`` to get
+        the next (older) page. ``commitment_type`` and ``department``
+        restrict the wall to exact matches.
+        """
+        clauses = []
+        params = []
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        if commitment_type:
+            clauses.append("commitment_type = ?")
+            params.append(commitment_type)
+        if department:
+            clauses.append("department = ?")
+            params.append(department)
+        sql = "SELECT * FROM commitments"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._query(sql, params)]
+
+    def count_commitments(self):
+        return self._query("SELECT COUNT(*) FROM commitments")[0][0]
+
+    def latest_commitment_id(self):
+        """Id of the newest commitment (0 when the wall is empty)."""
+        return self._query("SELECT COALESCE(MAX(id), 0) FROM commitments")[0][0]
+
+    def list_departments(self):
+        rows = self._query(
+            "SELECT DISTINCT department FROM commitments WHERE department != '' ORDER BY department"
+        )
+        return [row[0] for row in rows]
+
+    def list_case_responses(self, case_title, limit=20, before_id=None):
+        """Responses to one case, newest first, paged like ``list_commitments``."""
+        sql = "SELECT * FROM case_responses WHERE case_title = ?"
+        params = [case_title]
+        if before_id is not None:
+            sql += " AND id < ?"
+            params.append(before_id)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._query(sql, params)]
+
+    def case_response_counts(self):
+        """Mapping of case title to number of responses shared."""
+        rows = self._query(
+            "SELECT case_title, COUNT(*) FROM case_responses GROUP BY case_title"
+        )
+        return {title: count for title, count in rows}
+
+    def iter_chunks(self, kind, chunk_size=5000):
+        """Yield all rows of table ``kind`` as lists of dicts, oldest first.
+
+        Rows are read ``chunk_size`` at a time with an id cursor, so memory
+        stays bounded however large the table is.
+        """
+        if kind not in CHANGE_KINDS:
+            raise ValueError(f"unknown submission kind: {kind!r}")
+        sql = f"SELECT * FROM {kind} WHERE id > ? ORDER BY id LIMIT ?"
+        last_id = 0
+        while True:
+            rows = self._query(sql, (last_id, chunk_size))
+            if not rows:
+                return
+            yield [dict(row) for row in rows]
+            last_id = rows[-1]["id"]
+
+    def columns(self, kind):
+        """Column names of table ``kind``, in table order."""
+        if kind not in CHANGE_KINDS:
+            raise ValueError(f"unknown submission kind: {kind!r}")
+        return [row[1] for row in self._query(f"PRAGMA table_info({kind})")]
+
+    def iter_audit_scores(self, chunk_size=5000):
+        """Yield the score tuples of all stored audits, oldest first."""
+        sql = f"SELECT id, {', '.join(AUDIT_COLUMNS)} FROM audits WHERE id > ? ORDER BY id LIMIT ?"
+        last_id = 0
+        while True:
+            rows = self._query(sql, (last_id, chunk_size))
+            if not rows:
+                return
+            for row in rows:
+                yield tuple(row)[1:]
+            last_id = rows[-1][0]
+
+    def tallies(self):
+        """Mapping of tally counter name to its stored count."""
+        return {name: count for name, count in self._query("SELECT name, count FROM tallies")}
+
+    def latest_change(self):
+        """Sequence number of the newest change (0 when nothing is stored)."""
+        return self._query("SELECT COALESCE(MAX(seq), 0) FROM changes")[0][0]
+
+    def changes_since(self, cursor=0, limit=200):
+        """Items stored after sequence number ``cursor``, oldest first.
+
+        Returns ``(items, next_cursor)``; each item is the stored row as a
+        dict plus ``kind`` and ``seq``. Pass ``next_cursor`` back in to
+        continue. The cost is proportional to the number of new items.
+        """
+        changes = self._query(
+            "SELECT seq, kind, item_id FROM changes WHERE seq > ? ORDER BY seq LIMIT ?",
+            (cursor, limit),
+        )
+        if not changes:
+            return [], cursor
+        ids_by_kind = {}
+        for seq, kind, item_id in changes:
+            ids_by_kind.setdefault(kind, []).append(item_id)
+        rows = {}
+        for kind, ids in ids_by_kind.items():
+            if kind not in CHANGE_KINDS:
+                continue
+            placeholders = ", ".join("?" * len(ids))
+            for row in self._query(f"SELECT * FROM {kind} WHERE id IN ({placeholders})", ids):
+                rows[kind, row["id"]] = dict(row)
+        items = []
+        for seq, kind, item_id in changes:
+            row = rows.get((kind, item_id))
+            if row is not None:
+                items.append({**row, "kind": kind, "seq": seq})
+        return items, changes[-1][0]
@@ -1,7 +1,196 @@
+import functools
+import hmac
+import os
+import uuid
+
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import numpy as np
+
+# Only lightweight modules are imported here. matplotlib, NumPy and pandas
+# are imported inside the pages that use them, so a fresh worker only pays
+# for them once someone opens one of those pages.
+import metrics
+from admission import ACCEPTED, DUPLICATE, QUEUED, STATUS_MESSAGES, STORED
+from cases import CaseRegistry, render_responses
+from content import (APP_CSS_MIN, CASES_INTRO, CASES_TITLE, INTRO_CHART_CAPTION,
+                     INTRO_DEFINITION_HEADER, INTRO_TITLE, INTRO_WHY_HEADER, REFLECTIONS,
+                     REPRESENTATION_GAP_COLORS, REPRESENTATION_GAP_LABELS, REPRESENTATION_GAP_SERIES,
+                     REPRESENTATION_GAP_TITLE, intro_definition_markdown, intro_why_markdown)
+from feed import FeedView
+from wall import COMMITMENT_TYPES, PAGE_SIZE, render_commitment, render_page
+from workshops import StoreRegistry, WorkshopDirectory
+
+@st.cache_resource
+def start_metrics_exporters():
+    # No-op unless WORKSHOP_METRICS is set; see metrics.py
+    return metrics.start_exporters()
+
+@st.cache_resource
+def start_chart_warmup():
+    # Runs once per process: pre-render the audit charts people hit most
+    from charts import warm_audit_charts
+    return warm_audit_charts()
+
+@st.cache_resource
+def get_workshop_directory():
+    return WorkshopDirectory.from_file()
+
+@st.cache_resource
+def get_store_registry():
+    # One store (one writer thread, one reader pool) per workshop, shared by
+    # every session in that workshop. Only listed workshops get a store, so
+    # the per-workshop resources below are bounded by workshops.json.
+    directory = get_workshop_directory()
+    return StoreRegistry(directory.default, allowed=directory.codes())
+
+def get_store(workshop):
+    return get_store_registry().get(workshop)
+
+@st.cache_resource
+def get_submission_gate(workshop):
+    # Every write path goes through the gate: dedup, debounce, rate limits, backpressure
+    from admission import SubmissionGate
+    return SubmissionGate(get_store(workshop))
+
+def submit(kind, *args):
+    # Admit one submission for this session; returns an ``Admission``
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return get_submission_gate(workshop).submit(st.session_state.session_id, kind, *args)
+
+@st.cache_resource
+def get_audit_aggregator(workshop):
+    # Stored audits are replayed once at startup; afterwards every
+    # submission updates the running statistics directly
+    from audit import AuditAggregator
+    aggregator = AuditAggregator()
+    aggregator.add_many(get_store(workshop).iter_audit_scores())
+    return aggregator
+
+@st.cache_resource
+def get_percentile_index():
+    # Percentile ranks compare against every workshop edition, not just the
+    # current cohort, so all listed workshops' audits are replayed into one index
+    from audit import AuditAggregator
+    aggregator = AuditAggregator()
+    for code in get_workshop_directory().codes():
+        aggregator.add_many(get_store(code).iter_audit_scores())
+    return aggregator
+
+@st.cache_resource
+def get_theme_tracker(workshop):
+    # Shared by all facilitator sessions; each update only reads new submissions
+    from themes import ThemeTracker
+    return ThemeTracker(get_store(workshop))
+
+@st.cache_resource
+def get_case_registry():
+    # Loaded from case_studies/ once per process and shared by all sessions
+    return CaseRegistry.from_directory()
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def wall_page(workshop, before_id, commitment_type, department, version):
+    # Older pages never change, so only the first page is keyed by ``version``
+    # (the newest commitment id) and re-rendered when someone submits.
+    rows = get_store(workshop).list_commitments(PAGE_SIZE + 1, before_id, commitment_type, department)
+    next_cursor = rows[PAGE_SIZE - 1]['id'] if len(rows) > PAGE_SIZE else None
+    return render_page(rows[:PAGE_SIZE]), len(rows[:PAGE_SIZE]), next_cursor
+
+def export_file(workshop, kind, fmt):
+    # Called only when the download is clicked; rows are streamed in chunks
+    # into a temporary file rather than built up as one DataFrame
+    import tempfile
+    from export_data import export
+    f = tempfile.TemporaryFile()
+    export(get_store(workshop), kind, fmt, f)
+    f.seek(0)
+    return f
+
+@st.cache_resource
+def get_tally_service(workshop):
+    # One set of sharded counters per workshop, flushed to its store in the background
+    from tallies import TallyService
+    return TallyService(get_store(workshop), [key for key, _, _ in REFLECTIONS])
+
+def room_reflections(workshop):
+    # Anonymous room-wide totals; only this fragment reruns on the timer
+    participants, counts = get_tally_service(workshop).totals()
+    if not participants:
+        return
+    st.markdown("#### Across the Room")
+    for key, statement, _ in REFLECTIONS:
+        share = counts[key] / participants
+        st.progress(min(max(share, 0.0), 1.0),
+                    text=f"{share:.0%} ({counts[key]} of {participants}): {statement}")
+
+# Low-bandwidth sessions refresh the room tallies less often
+room_reflections_live = st.fragment(run_every=5)(room_reflections)
+room_reflections_lite = st.fragment(run_every=30)(room_reflections)
+
+def send_image(data, part="chart"):
+    # Image bytes travel to the browser on top of the page itself
+    metrics.inc("workshop_sent_bytes_total", len(data), page=page, part=part)
+    st.image(data, width="stretch")
+
+def send_svg(svg, part="chart"):
+    # Inline SVG charts are part of the page, but counted like images
+    metrics.inc("workshop_sent_bytes_total", len(svg.encode("utf-8")), page=page, part=part)
+    st.markdown(svg, unsafe_allow_html=True)
+
+# The dashboard shows every participant's submissions and exports them, so
+# it is locked behind a key given to facilitators out of band
+FACILITATOR_KEY = os.environ.get("WORKSHOP_FACILITATOR_KEY", "")
+
+def unlock_dashboard():
+    entered = st.session_state.pop("facilitator_key_input", "")
+    if FACILITATOR_KEY and hmac.compare_digest(entered.encode(), FACILITATOR_KEY.encode()):
+        st.session_state.facilitator_unlocked = True
+    else:
+        st.session_state.facilitator_key_rejected = True
+
+def reset_wall_cursor():
+    st.session_state.wall_cursors = []
+
+def change_workshop():
+    # Cursors and feeds belong to the previous workshop's store
+    st.session_state.pop("live_feed", None)
+    reset_wall_cursor()
+    try:
+        st.query_params["workshop"] = get_workshop_directory().resolve(st.session_state.workshop_code)
+    except ValueError:
+        pass
+
+@st.fragment(run_every=5)
+def live_feed(workshop):
+    # Only this fragment reruns on the timer, and each run fetches just the
+    # submissions stored since this session's last cursor
+    if "live_feed" not in st.session_state:
+        st.session_state.live_feed = FeedView()
+    feed = st.session_state.live_feed
+    feed.refresh(get_store(workshop))
+    if feed.items:
+        st.markdown(feed.html(), unsafe_allow_html=True)
+    else:
+        st.info("New commitments, audits and case responses will appear here as they arrive.")
+
+@st.fragment(run_every=15)
+def theme_summary(workshop):
+    # Reruns on its own timer, so new submissions show up in the themes
+    # without rerunning (and re-querying) the rest of the dashboard
+    tracker = get_theme_tracker(workshop)
+    tracker.update()
+    theme_source = st.radio("Themes in:", ["Commitments by type", "Case responses by case"], horizontal=True,
+                            key="theme_source")
+    index = tracker.commitments if theme_source == "Commitments by type" else tracker.case_responses
+    groups = index.groups()
+    if groups:
+        for group in groups:
+            top_terms = index.top_terms(group, n=8)
+            clusters = index.clusters(group, n=3)
+            st.markdown(f"**{group}**: " + ", ".join(term for term, _ in top_terms))
+            if clusters:
+                st.caption("Most common focus: " + "; ".join(f"{term} ({count})" for term, count in clusters))
+    else:
+        st.info("Themes will appear once participants start submitting.")
 
 # Set page config
 st.set_page_config(
@@ -10,49 +199,10 @@ st.set_page_config(
     layout="wide",
 )
 
-# Custom CSS for better appearance
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.3rem;
-        color: #2E7D32;
-        text-align: center;
-        margin-bottom: 20px;
-    }
-    .section-header {
-        font-size: 1.5rem;
-        color: #1565C0;
-        margin-top: 25px;
-        margin-bottom: 15px;
-    }
-    .case-box {
-        background-color: #E3F2FD;
-        padding: 15px;
-        border-radius: 10px;
-        margin-bottom: 15px;
-        border-left: 5px solid #1565C0;
-    }
-    .response-box {
-        background-color: #FFFDE7;
-        padding: 15px;
-        border-radius: 10px;
-        margin-top: 15px;
-        border-left: 5px solid #FBC02D;
-    }
-    .info-box {
-        background-color: #E8F5E9;
-        padding: 15px;
-        border-radius: 10px;
-        margin-bottom: 15px;
-    }
-    .footer {
-        font-size: 0.8rem;
-        color: #757575;
-        text-align: center;
-        margin-top: 50px;
-    }
-</style>
-""", unsafe_allow_html=True)
+start_metrics_exporters()
+
+# Custom CSS for better appearance (resent with every rerun, so minified)
+st.markdown(f"<style>{APP_CSS_MIN}</style>", unsafe_allow_html=True)
 
 # Sidebar navigation
 with st.sidebar:
@@ -61,68 +211,72 @@ with st.sidebar:
     # Simple navigation
     page = st.radio(
         "Select a section:",
-        ["Introduction", "Case Studies Explorer", "Quick Gender Audit", "Commitment Wall"]
+        ["Introduction", "Case Studies Explorer", "Quick Gender Audit", "Commitment Wall", "Facilitator Dashboard"],
+        key="page",
     )
     
     st.markdown("---")
-    st.markdown("**Workshop: Gender, One Health, Safeguarding, and Human Rights Principles Training**")
-    st.markdown("**Presenter: Prof. Salome Bukachi**")
-    st.markdown("**University of Nairobi**")
+    
+    # Every submission is stored under the workshop code (shared as ?workshop=<code>)
+    directory = get_workshop_directory()
+    if "workshop_code" not in st.session_state:
+        st.session_state.workshop_code = st.query_params.get("workshop", directory.default)
+    st.text_input("Workshop code:", key="workshop_code", on_change=change_workshop)
+    try:
+        workshop = directory.resolve(st.session_state.workshop_code)
+    except ValueError as exc:
+        st.error(f"{exc} Showing the default workshop instead.")
+        workshop = directory.default
+    workshop_info = directory.info(workshop)
+    
+    for line in workshop_info["sidebar"]:
+        st.markdown(line)
+    
+    st.markdown("---")
+    
+    # Hand-built SVG charts instead of chart images, and slower live refreshes
+    # (also enabled by opening the app with ?lite=1)
+    if "low_bandwidth" not in st.session_state:
+        st.session_state.low_bandwidth = st.query_params.get("lite") == "1"
+    low_bandwidth = st.toggle("Low-bandwidth mode", key="low_bandwidth",
+                              help="Uses much less data; recommended on mobile connections.")
+
+metrics.inc("workshop_page_views_total", page=page)
+metrics.inc("workshop_sent_bytes_total", len(APP_CSS_MIN), page=page, part="css")
+page_timer = metrics.timer("workshop_page_render_seconds", page=page)
 
 # INTRODUCTION PAGE
 if page == "Introduction":
-    st.markdown('<h1 class="main-header">Gender-Responsive Workplaces</h1>', unsafe_allow_html=True)
+    st.markdown(f'<h1 class="main-header">{INTRO_TITLE}</h1>', unsafe_allow_html=True)
     
     # Two-column layout for intro section
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        st.markdown('<h2 class="section-header">What is a Gender-Responsive Workplace?</h2>', unsafe_allow_html=True)
-        
-        st.markdown("""
-        A gender-responsive workplace:
-        
-        1. Notices the not-usually-visible needs and problems of women employees
-        2. Creates solutions in response to these needs
-        3. Takes steps and actions to implement the created solutions
-        4. Monitors the results in the long term
-        5. Actively endeavors to increase the satisfaction of employees and to remedy complaints
+        st.markdown(f'<h2 class="section-header">{INTRO_DEFINITION_HEADER}</h2>', unsafe_allow_html=True)
         
-        *Source: A Guide for Gender-Responsive Companies and Institutions*
-        """)
+        st.markdown(intro_definition_markdown())
         
-        st.markdown('<h2 class="section-header">Why Gender-Responsive Workplaces Matter</h2>', unsafe_allow_html=True)
+        st.markdown(f'<h2 class="section-header">{INTRO_WHY_HEADER}</h2>', unsafe_allow_html=True)
         
-        st.markdown("""
-        • Diverse teams produce more innovative research
-        • Better problem-solving through varied perspectives
-        • More comprehensive research design
-        • Improved community engagement
-        • Enhanced research relevance for diverse populations
-        """)
+        st.markdown(intro_why_markdown())
     
     with col2:
-        # Add a simple illustration or chart
-        labels = ['Male', 'Female']
-        leadership = [85, 15]  # Example data
-        researchers = [55, 45]  # Example data
-        
-        fig, ax = plt.subplots(figsize=(8, 6))
-        x = np.arange(len(labels))
-        width = 0.35
-        
-        ax.bar(x - width/2, leadership, width, label='Leadership Positions', color='#1565C0')
-        ax.bar(x + width/2, researchers, width, label='Researchers', color='#2E7D32')
-        
-        ax.set_ylabel('Percentage')
-        ax.set_title('Gender Representation Gap in Research Organizations')
-        ax.set_xticks(x)
-        ax.set_xticklabels(labels)
-        ax.legend()
-        
-        st.pyplot(fig)
+        # Add a simple illustration or chart (rendered once per process)
+        with metrics.timer("workshop_step_seconds", step="intro_chart"):
+            if low_bandwidth:
+                # About 1.4 KB of inline SVG instead of a ~50 KB image
+                from lite_charts import bar_chart_svg
+                send_svg(bar_chart_svg(REPRESENTATION_GAP_LABELS, REPRESENTATION_GAP_SERIES,
+                                       REPRESENTATION_GAP_COLORS, 100, REPRESENTATION_GAP_TITLE))
+            else:
+                from charts import RenderTimeout, representation_gap_chart
+                try:
+                    send_image(representation_gap_chart())
+                except RenderTimeout:
+                    st.warning("The chart is still being drawn. It will appear when the page next refreshes.")
         
-        st.markdown("*Example data showing the gender gap between research staff and leadership positions*")
+        st.markdown(f"*{INTRO_CHART_CAPTION}*")
     
     # Simple interactive reflection element
     st.markdown('<h2 class="section-header">Reflection: Gender Dynamics in Your Workplace</h2>', unsafe_allow_html=True)
@@ -131,173 +285,54 @@ if page == "Introduction":
     
     col1, col2 = st.columns(2)
     
-    with col1:
-        reflection1 = st.checkbox("I have witnessed gender bias at work")
-        reflection2 = st.checkbox("I know someone who was denied a promotion due to gender")
-        reflection3 = st.checkbox("I believe the gender pay gap exists in my organization")
+    half = (len(REFLECTIONS) + 1) // 2
+    selections = []
+    for i, (key, statement, _) in enumerate(REFLECTIONS):
+        with col1 if i < half else col2:
+            selections.append(st.checkbox(statement, key=key))
     
-    with col2:
-        reflection4 = st.checkbox("I have felt unheard in a meeting because of my gender")
-        reflection5 = st.checkbox("I think flexible work policies are applied differently for men and women")
-        reflection6 = st.checkbox("I've observed different standards for mothers vs. fathers at work")
+    # Count this session's choices in the room tally; reruns with the same
+    # boxes ticked change nothing
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    get_tally_service(workshop).record(st.session_state.session_id, selections)
     
     # Show insights based on selections
-    if any([reflection1, reflection2, reflection3, reflection4, reflection5, reflection6]):
-        selected = sum([reflection1, reflection2, reflection3, reflection4, reflection5, reflection6])
+    if any(selections):
+        selected = sum(selections)
         
         st.markdown('<div class="response-box">', unsafe_allow_html=True)
         st.markdown(f"You selected {selected} statement(s). These observations are common in many organizations.")
         
-        if reflection1:
-            st.markdown("**Gender bias** can manifest in subtle ways, from who gets called on in meetings to how performance is evaluated.")
-            
-        if reflection2:
-            st.markdown("**Promotion barriers** often stem from biased perceptions of leadership abilities and potential.")
-            
-        if reflection3:
-            st.markdown("**Pay disparities** persist in many sectors, often beginning with initial salary negotiations and compounding over time.")
-            
-        if reflection4:
-            st.markdown("**Being unheard** in meetings is a common experience, especially for women and those from marginalized groups.")
-            
-        if reflection5:
-            st.markdown("**Flexibility stigma** often affects women more than men, with assumptions about who 'should' use family leave policies.")
-            
-        if reflection6:
-            st.markdown("**Parental double standards** remain prevalent, with different expectations for mothers versus fathers in the workplace.")
+        for (_, _, insight), checked in zip(REFLECTIONS, selections):
+            if checked:
+                st.markdown(insight)
             
         st.markdown("</div>", unsafe_allow_html=True)
+    
+    if low_bandwidth:
+        room_reflections_lite(workshop)
+    else:
+        room_reflections_live(workshop)
 
 # CASE STUDIES EXPLORER
 elif page == "Case Studies Explorer":
-    st.markdown('<h1 class="main-header">Case Studies Explorer</h1>', unsafe_allow_html=True)
+    st.markdown(f'<h1 class="main-header">{CASES_TITLE}</h1>', unsafe_allow_html=True)
     
-    st.markdown("""
-    Explore these real-world-inspired scenarios and discuss potential solutions with your group.
-    Select a case study to view details and discussion questions.
-    """)
+    st.markdown(CASES_INTRO)
     
-    # Case study selection
-    case_study = st.selectbox(
-        "Select a case study:",
-        [
-            "Case 1: The Invisible Candidate",
-            "Case 2: The Salary Secret",
-            "Case 3: The Broken Ladder",
-            "Case 4: The Dedicated Father vs. Distracted Mother",
-            "Case 5: The Diversity Hire"
-        ]
-    )
+    # Case study search and selection
+    registry = get_case_registry()
+    query = st.text_input("Search cases by keyword:", placeholder="e.g. negotiation, mentoring, parental")
+    matches = registry.search(query)
     
-    # Case study content
-    cases = {
-        "Case 1: The Invisible Candidate": {
-            "scenario": """
-            Dr. Sarah, a senior researcher with an impressive publication record in entomology, recently applied for the position of Department Head. 
-            Despite her strong publication record and successful grant history, she consistently finds herself on the shortlist but never selected. 
-            
-            During a recent recruitment, she overheard colleagues suggesting she might not be 'assertive enough' to lead the department, and that her family responsibilities might interfere with leadership duties. 
-            
-            Meanwhile, a male colleague with fewer publications but known for his confident presentation style is being strongly considered for the position.
-            """,
-            "questions": [
-                "What biases are present in this hiring decision?",
-                "How do stereotypes about leadership impact women's career growth?",
-                "What organizational policies could prevent such biased hiring?"
-            ],
-            "key_issues": [
-                "Gender stereotypes about leadership qualities",
-                "Assumptions about family responsibilities",
-                "Valuing style over substance in leadership assessment",
-                "Implicit bias in evaluation criteria"
-            ]
-        },
-        "Case 2: The Salary Secret": {
-            "scenario": """
-            During an informal lunch discussion, three researchers at a research organization discover significant differences in their starting salaries despite similar qualifications and experience. 
-            
-            Dr. James started at $5,000 higher than Dr. Lucy, though both joined the same project last year with comparable expertise. Dr. Lucy learns that James negotiated his salary aggressively while she accepted the first offer, having been previously advised to 'be grateful' for opportunities. 
-            
-            The conversation reveals a pattern where female colleagues consistently started at lower salary points, creating a compounding effect on their career earnings.
-            """,
-            "questions": [
-                "What structural issues enable gender pay disparities to persist?",
-                "Why do women often face challenges in salary negotiations?",
-                "What policies could create more equitable compensation?"
-            ],
-            "key_issues": [
-                "Lack of salary transparency",
-                "Gendered expectations in negotiation",
-                "Socialization differences that affect negotiation behavior",
-                "Compounding effects of initial pay disparities"
-            ]
-        },
-        "Case 3: The Broken Ladder": {
-            "scenario": """
-            At an organization's annual research symposium, Dr. Grace notices that while 45% of junior researchers are women, only 15% of research department heads are female. 
-            
-            When a leadership position opens in her department, she witnesses a familiar pattern: senior female researchers are directed toward 'support roles' like committee work and mentoring, while male colleagues are encouraged to pursue executive positions. 
-            
-            Despite her strong track record in both research and team management, she's advised to 'gain more experience' before pursuing leadership roles.
-            """,
-            "questions": [
-                "How do informal mentoring and guidance differ by gender?",
-                "What role do institutional networks play in leadership advancement?",
-                "How can leadership development be made more inclusive?"
-            ],
-            "key_issues": [
-                "Pipeline problems vs. 'leaky bucket' issues",
-                "Gender differences in mentoring and sponsorship",
-                "Hidden workload of service activities for women",
-                "Moving goalposts for advancement requirements"
-            ]
-        },
-        "Case 4: The Dedicated Father vs. Distracted Mother": {
-            "scenario": """
-            Two researchers at a research organization, Thomas and Diana, both have young children. 
-            
-            When Thomas leaves early for his child's school event, colleagues praise him as a 'dedicated father.' When Diana does the same, subtle comments arise about her 'divided priorities.' 
-            
-            During fieldwork planning, assumptions are made about Diana's availability for extended field visits, while Thomas's parental status is never mentioned. 
-            
-            The situation intensifies when both apply for project leadership roles, and concerns about Diana's 'reliability' are raised due to her family responsibilities.
-            """,
-            "questions": [
-                "How do gendered expectations about caregiving affect career progression?",
-                "Why are similar actions interpreted differently based on gender?",
-                "What policies could address these double standards?"
-            ],
-            "key_issues": [
-                "Double standards for parenting responsibilities",
-                "Different narratives for the same behavior based on gender",
-                "Unexamined assumptions about availability and commitment",
-                "How 'ideal worker' norms disadvantage women"
-            ]
-        },
-        "Case 5: The Diversity Hire": {
-            "scenario": """
-            Dr. Aisha, a young female researcher from Northern Kenya, joins an organization's climate change adaptation project. 
-            
-            Despite her innovative research approach and strong academic background, she frequently encounters colleagues who assume she was hired to 'tick boxes.' She faces multiple layers of bias - some question her expertise because of her gender, others make assumptions about her background, and she often finds herself having to repeatedly prove her competence. 
-            
-            During team meetings, she notices her suggestions gain traction only when repeated by others.
-            """,
-            "questions": [
-                "How do multiple aspects of identity impact workplace experiences?",
-                "What are the cumulative effects of facing multiple forms of bias?",
-                "How can organizations address intersectional challenges?"
-            ],
-            "key_issues": [
-                "Intersectionality of gender, ethnicity, and age biases",
-                "Stereotype threat and its impact on performance",
-                "Tokenism and its psychological burden",
-                "'Prove it again' bias affecting marginalized groups"
-            ]
-        }
-    }
+    if not matches:
+        st.info("No case studies match your search. Showing all cases.")
+    
+    case_study = st.selectbox("Select a case study:", matches or registry.titles())
     
     # Display selected case
-    selected_case = cases[case_study]
+    selected_case = registry[case_study]
     
     st.markdown('<div class="case-box">', unsafe_allow_html=True)
     st.markdown("### Scenario")
@@ -325,15 +360,27 @@ elif page == "Case Studies Explorer":
     
     if st.button("Share with Workshop"):
         if group_insights and proposed_solutions:
-            st.markdown('<div class="response-box">', unsafe_allow_html=True)
-            st.markdown("#### Thank you for sharing your insights!")
-            st.markdown("Your contributions will be included in the workshop discussion. Be prepared to share key points with the larger group.")
-            st.markdown("</div>", unsafe_allow_html=True)
+            # Queued for the background writer; the page doesn't wait for the commit
+            admission = submit("case_responses", case_study, group_insights, proposed_solutions)
+            if admission.status in STORED:
+                metrics.inc("workshop_submissions_total", kind="case_response")
+            if admission.status in (ACCEPTED, QUEUED, DUPLICATE):
+                st.markdown('<div class="response-box">', unsafe_allow_html=True)
+                st.markdown("#### Thank you for sharing your insights!")
+                st.markdown("Your contributions will be included in the workshop discussion. Be prepared to share key points with the larger group.")
+                st.markdown("</div>", unsafe_allow_html=True)
+            if admission.status != ACCEPTED:
+                st.info(STATUS_MESSAGES[admission.status])
         else:
             st.warning("Please enter both insights and proposed solutions before sharing.")
 
 # QUICK GENDER AUDIT
 elif page == "Quick Gender Audit":
+    from audit import AUDIT_CATEGORIES, recommendations_markdown, score_audit, score_dataframe
+    from charts import AUDIT_COLORS, RenderTimeout, audit_chart
+    
+    start_chart_warmup()
+    
     st.markdown('<h1 class="main-header">Quick Gender Audit</h1>', unsafe_allow_html=True)
     
     st.markdown("""
@@ -365,76 +412,82 @@ elif page == "Quick Gender Audit":
     
     # Display results if form submitted
     if submit_button:
-        scores = [leadership_score, recruitment_score, environment_score, balance_score, resources_score]
-        average_score = sum(scores) / len(scores)
+        with metrics.timer("workshop_step_seconds", step="audit_scoring"):
+            scores = [leadership_score, recruitment_score, environment_score, balance_score, resources_score]
+            
+            # Simple recommendations based on lowest scores
+            average_score, lowest_categories = score_audit(scores)
+            
+            # Compare against everyone before this submission, then record it
+            # (recalculating the same scores again doesn't count twice)
+            percentile_index = get_percentile_index()
+            ranks = percentile_index.percentiles(scores)
+            prior_count = percentile_index.count
+            admission = submit("audits", scores)
+            if admission.status in STORED:
+                percentile_index.add(scores)
+                get_audit_aggregator(workshop).add(scores)
+        if admission.status in STORED:
+            metrics.inc("workshop_submissions_total", kind="audit")
+        if admission.status not in (ACCEPTED, DUPLICATE):
+            st.info(STATUS_MESSAGES[admission.status])
         
         st.markdown("### Your Gender Audit Results")
         
-        # Create a simple visualization
-        categories = ['Leadership', 'Recruitment', 'Environment', 'Work-Life', 'Resources']
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        bars = ax.bar(categories, scores, color=['#1976D2', '#2E7D32', '#7B1FA2', '#C62828', '#F57F17'])
-        
-        # Add a horizontal line for the average
-        ax.axhline(y=3, color='gray', linestyle='--', alpha=0.7)
-        
-        # Customize the chart
-        ax.set_ylim(0, 5.5)
-        ax.set_ylabel('Score (1-5)')
-        ax.set_title('Gender-Responsiveness by Category')
-        
-        # Add value labels
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                    f'{height}',
-                    ha='center', va='bottom')
-        
-        st.pyplot(fig)
+        # Chart images are cached per score tuple (only 3,125 are possible)
+        with metrics.timer("workshop_step_seconds", step="audit_chart"):
+            if low_bandwidth:
+                from lite_charts import bar_chart_svg
+                send_svg(bar_chart_svg(AUDIT_CATEGORIES, {"Score (1-5)": scores}, AUDIT_COLORS, 5,
+                                       "Gender-Responsiveness by Category", reference=3))
+            else:
+                try:
+                    send_image(audit_chart(scores))
+                except RenderTimeout:
+                    st.warning("Your chart is taking longer than usual; the scores below are complete.")
         
         # Provide a simple interpretation
         st.markdown(f"**Overall Gender-Responsiveness Score: {average_score:.1f}/5**")
         
-        # Simple recommendations based on lowest scores
-        lowest_categories = sorted(zip(categories, scores), key=lambda x: x[1])[:2]
+        if ranks is not None:
+            overall_rank, category_ranks = ranks
+            st.markdown(f"**Percentile rank: {overall_rank:.0f} out of 100**, compared with the "
+                        f"{prior_count:,} audit(s) submitted so far across all workshops.")
+            st.markdown("Percentile rank by category: " + " • ".join(
+                f"{category} {rank:.0f}" for category, rank in zip(AUDIT_CATEGORIES, category_ranks)))
         
         st.markdown("### Focus Areas for Improvement")
         st.markdown("Based on your assessment, consider these priority areas:")
         
         for category, score in lowest_categories:
             st.markdown(f"**{category} (Score: {score})**")
+            st.markdown(recommendations_markdown(category))
+    
+    # Bulk scoring for departments that filled in the audit elsewhere
+    with st.expander("Score many departments at once (CSV upload)"):
+        st.markdown(
+            "Upload a CSV with one row per department and a 1-5 score in each of the columns "
+            + ", ".join(f"**{category}**" for category in AUDIT_CATEGORIES)
+            + ". Other columns, such as the department name, are kept in the results."
+        )
+        st.download_button("Download a blank template",
+                           data="Department," + ",".join(AUDIT_CATEGORIES) + "\n",
+                           file_name="gender_audit_template.csv", mime="text/csv")
+        
+        uploaded = st.file_uploader("Audit scores (CSV)", type="csv")
+        if uploaded is not None:
+            import pandas as pd
             
-            if category == 'Leadership':
-                st.markdown("""
-                • Establish clear, objective criteria for leadership selection
-                • Create mentoring programs that connect women with leadership opportunities
-                • Review decision-making processes for inclusivity
-                """)
-            elif category == 'Recruitment':
-                st.markdown("""
-                • Implement blind resume screening where possible
-                • Train hiring committees on recognizing implicit bias
-                • Standardize interview questions and evaluation metrics
-                """)
-            elif category == 'Environment':
-                st.markdown("""
-                • Develop and enforce clear anti-harassment policies
-                • Create channels for reporting bias or discrimination
-                • Provide regular gender sensitivity training
-                """)
-            elif category == 'Work-Life':
-                st.markdown("""
-                • Review flexible work policies for accessibility to all genders
-                • Normalize parental leave for all parents
-                • Consider caregiving responsibilities in meeting and travel schedules
-                """)
-            elif category == 'Resources':
-                st.markdown("""
-                • Audit resource allocation patterns by gender
-                • Create transparent processes for equipment and funding requests
-                • Ensure equal access to professional development opportunities
-                """)
+            try:
+                with metrics.timer("workshop_step_seconds", step="audit_batch_scoring"):
+                    results = score_dataframe(pd.read_csv(uploaded))
+            except (ValueError, pd.errors.ParserError) as exc:
+                st.error(str(exc))
+            else:
+                st.success(f"Scored {len(results)} audit(s).")
+                st.dataframe(results, width="stretch", hide_index=True)
+                st.download_button("Download results", data=results.to_csv(index=False),
+                                   file_name="gender_audit_results.csv", mime="text/csv")
 
 # COMMITMENT WALL
 elif page == "Commitment Wall":
@@ -450,17 +503,7 @@ elif page == "Commitment Wall":
         name = st.text_input("Your Name (Optional):")
         department = st.text_input("Department/Unit:")
         
-        commitment_type = st.selectbox(
-            "Type of Commitment:",
-            [
-                "Personal Practice Change",
-                "Advocating for Policy Change",
-                "Supporting Colleagues",
-                "Challenging Bias",
-                "Creating Resources",
-                "Other"
-            ]
-        )
+        commitment_type = st.selectbox("Type of Commitment:", COMMITMENT_TYPES)
         
         commitment = st.text_area("I commit to:", height=100, 
                                   placeholder="Example: I commit to ensuring gender balance on all hiring committees I participate in...")
@@ -470,29 +513,47 @@ elif page == "Commitment Wall":
     # Display submitted commitment
     if submit_commitment:
         if commitment:
-            st.success("Thank you for your commitment!")
-            
-            # Display the commitment
-            st.markdown('<div class="response-box">', unsafe_allow_html=True)
-            if name:
-                st.markdown(f"**{name}** from **{department}** commits to:")
+            save_failed = False
+            with metrics.timer("workshop_step_seconds", step="commitment_submit"):
+                admission = submit("commitments", name, department, commitment_type, commitment)
+                if admission.status == ACCEPTED:
+                    # Wait for the commit so the wall below already shows it;
+                    # a queued submission returns straight away instead
+                    try:
+                        admission.future.result(timeout=10)
+                    except Exception:
+                        # Timed out (store busy) or the write itself failed
+                        save_failed = True
+            if admission.status in STORED and not save_failed:
+                metrics.inc("workshop_submissions_total", kind="commitment")
+            if save_failed:
+                st.warning("Your commitment could not be saved just now. Please try again in a moment.")
+            elif admission.status == ACCEPTED:
+                st.success("Thank you for your commitment!")
+            elif admission.status in (QUEUED, DUPLICATE):
+                st.info(STATUS_MESSAGES[admission.status])
             else:
-                st.markdown(f"A participant from **{department}** commits to:")
-            
-            st.markdown(f"*{commitment}*")
-            st.markdown(f"**Area**: {commitment_type}")
-            st.markdown("</div>", unsafe_allow_html=True)
-            
-            # Simple encouragement
-            st.markdown("""
-            ### Making Change Happen
-            
-            Remember that creating a gender-responsive workplace requires both individual and collective action.
+                st.warning(STATUS_MESSAGES[admission.status])
             
-            Small changes in daily practices can lead to significant shifts in workplace culture over time.
-            
-            Consider sharing your commitment with colleagues and checking in on progress in 1-2 months.
-            """)
+            if admission.status in (ACCEPTED, QUEUED, DUPLICATE) and not save_failed:
+                # Display the commitment
+                st.markdown(render_commitment({
+                    "name": name,
+                    "department": department,
+                    "commitment_type": commitment_type,
+                    "commitment": commitment,
+                }, box_class="response-box"), unsafe_allow_html=True)
+                
+                # Simple encouragement
+                st.markdown("""
+                ### Making Change Happen
+                
+                Remember that creating a gender-responsive workplace requires both individual and collective action.
+                
+                Small changes in daily practices can lead to significant shifts in workplace culture over time.
+                
+                Consider sharing your commitment with colleagues and checking in on progress in 1-2 months.
+                """)
         else:
             st.warning("Please enter your commitment before submitting.")
     
@@ -503,33 +564,154 @@ elif page == "Commitment Wall":
         {
             "name": "Dr. Thomas Odhiambo",
             "department": "Entomology",
-            "type": "Challenging Bias",
+            "commitment_type": "Challenging Bias",
             "commitment": "I commit to speaking up when I notice colleagues being interrupted in meetings, ensuring everyone has an equal chance to contribute."
         },
         {
             "name": "Dr. Jane Mwangi",
             "department": "Vector Biology",
-            "type": "Supporting Colleagues",
+            "commitment_type": "Supporting Colleagues",
             "commitment": "I commit to mentoring at least two junior female researchers in my field and advocating for their inclusion in key research projects."
         },
         {
             "name": "John Kamau",
             "department": "Human Resources",
-            "type": "Advocating for Policy Change",
+            "commitment_type": "Advocating for Policy Change",
             "commitment": "I commit to conducting a gender pay analysis within our department and presenting recommendations to leadership."
         }
     ]
     
-    for i, comm in enumerate(sample_commitments):
-        st.markdown(f"<div class='info-box'>", unsafe_allow_html=True)
-        st.markdown(f"**{comm['name']}** from **{comm['department']}** commits to:")
-        st.markdown(f"*{comm['commitment']}*")
-        st.markdown(f"**Area**: {comm['type']}")
-        st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown(render_page(sample_commitments), unsafe_allow_html=True)
+    
+    # Display commitments saved during this workshop, one page at a time
+    store = get_store(workshop)
+    if store.latest_commitment_id():
+        st.markdown("### From This Workshop")
+        
+        if "wall_cursors" not in st.session_state:
+            st.session_state.wall_cursors = []
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            type_filter = st.selectbox("Filter by type:", ["All"] + COMMITMENT_TYPES,
+                                       key="wall_type_filter", on_change=reset_wall_cursor)
+        with col2:
+            department_filter = st.selectbox("Filter by department:", ["All"] + store.list_departments(),
+                                             key="wall_department_filter", on_change=reset_wall_cursor)
+        
+        cursors = st.session_state.wall_cursors
+        before_id = cursors[-1] if cursors else None
+        with metrics.timer("workshop_step_seconds", step="wall_render"):
+            page_html, page_count, next_cursor = wall_page(
+                workshop,
+                before_id,
+                None if type_filter == "All" else type_filter,
+                None if department_filter == "All" else department_filter,
+                store.latest_commitment_id() if before_id is None else 0,
+            )
+            
+            if page_count:
+                st.markdown(page_html, unsafe_allow_html=True)
+            else:
+                st.info("No commitments match these filters yet.")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if cursors and st.button("← Newer"):
+                cursors.pop()
+                st.rerun()
+        with col2:
+            if next_cursor is not None and st.button("Older →"):
+                cursors.append(next_cursor)
+                st.rerun()
+
+# FACILITATOR DASHBOARD
+elif page == "Facilitator Dashboard" and not st.session_state.get("facilitator_unlocked"):
+    st.markdown('<h1 class="main-header">Facilitator Dashboard</h1>', unsafe_allow_html=True)
+    
+    if not FACILITATOR_KEY:
+        st.info("The Facilitator Dashboard is turned off. Set WORKSHOP_FACILITATOR_KEY on the server to enable it.")
+    else:
+        st.text_input("Facilitator key:", type="password", key="facilitator_key_input",
+                      on_change=unlock_dashboard)
+        if st.session_state.pop("facilitator_key_rejected", False):
+            st.error("That key is not correct.")
+
+elif page == "Facilitator Dashboard":
+    import numpy as np
+    import pandas as pd
+    from audit import AUDIT_CATEGORIES
+    
+    st.markdown('<h1 class="main-header">Facilitator Dashboard</h1>', unsafe_allow_html=True)
+    
+    st.markdown('<h2 class="section-header">Live Feed</h2>', unsafe_allow_html=True)
+    
+    live_feed(workshop)
+    
+    st.markdown('<h2 class="section-header">Quick Gender Audit: Room Overview</h2>', unsafe_allow_html=True)
+    
+    stats = get_audit_aggregator(workshop).snapshot()
+    if stats["count"]:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Audits submitted", stats["count"])
+        col2.metric("Room average score", f"{stats['overall_mean']:.2f}/5")
+        col3.metric("Spread (std. dev.)", f"{np.sqrt(stats['overall_variance']):.2f}")
+        
+        summary = pd.DataFrame({
+            "Average": stats["means"].round(2),
+            "Std. dev.": np.sqrt(stats["variances"]).round(2),
+        }, index=AUDIT_CATEGORIES)
+        st.dataframe(summary, width="stretch")
+        
+        st.markdown("**How the room rated each category**")
+        histograms = pd.DataFrame(stats["histograms"].T, index=[1, 2, 3, 4, 5], columns=AUDIT_CATEGORIES)
+        histograms.index.name = "Score"
+        st.bar_chart(histograms, stack=False)
+    else:
+        st.info("No audits have been submitted yet.")
+    
+    st.markdown('<h2 class="section-header">Case Study Responses</h2>', unsafe_allow_html=True)
+    
+    response_counts = get_store(workshop).case_response_counts()
+    if response_counts:
+        titles = get_case_registry().titles()
+        titles += [title for title in response_counts if title not in titles]
+        feed_case = st.selectbox("Case study:", titles,
+                                 format_func=lambda title: f"{title} ({response_counts.get(title, 0)})")
+        responses = get_store(workshop).list_case_responses(feed_case, limit=50)
+        if responses:
+            st.markdown(render_responses(responses), unsafe_allow_html=True)
+        else:
+            st.info("No groups have shared responses for this case yet.")
+    else:
+        st.info("No case study responses have been shared yet.")
+    
+    st.markdown('<h2 class="section-header">Recurring Themes</h2>', unsafe_allow_html=True)
+    
+    theme_summary(workshop)
+    
+    st.markdown('<h2 class="section-header">Export Submissions</h2>', unsafe_allow_html=True)
+    
+    from export_data import FORMATS
+    export_kinds = {"Commitments": "commitments", "Audit results": "audits", "Case responses": "case_responses"}
+    col1, col2 = st.columns(2)
+    with col1:
+        export_label = st.selectbox("Data:", list(export_kinds))
+    with col2:
+        export_format = st.radio("Format:", list(FORMATS), format_func=str.upper, horizontal=True)
+    mime, extension = FORMATS[export_format]
+    st.download_button(
+        f"Download {export_label.lower()}",
+        data=functools.partial(export_file, workshop, export_kinds[export_label], export_format),
+        file_name=f"{workshop}-{export_kinds[export_label]}.{extension}",
+        mime=mime,
+    )
+
+page_timer.stop()
 
 # Footer
 st.markdown("---")
 st.markdown('<div class="footer">', unsafe_allow_html=True)
-st.markdown("Gender, One Health, Safeguarding, and Human Rights Principles Training Workshop")
-st.markdown("International Centre of Insect Physiology and Ecology (ICIPE), Nairobi, Kenya • February 2025")
+for line in workshop_info["footer"]:
+    st.markdown(line)
 st.markdown("</div>", unsafe_allow_html=True)
\ No newline at end of file
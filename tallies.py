@@ -0,0 +1,154 @@
+"""Live anonymous tallies for the Introduction reflection checkboxes.
+
+Each statement has one counter. Counters are split across shards picked by
+session id, each with its own lock, so sessions toggling checkboxes at the
+same time rarely wait on each other. Every session's current choices are
+remembered, so a rerun that reports the same boxes again changes nothing
+and unticking a box takes back exactly the one vote it added.
+
+Changes accumulate in the shards and a background thread hands them to the
+store every ``flush_interval`` seconds, so the counts survive a restart
+without a database write per click. No names or session ids are stored,
+only the totals.
+
+Remembered choices are dropped for sessions idle longer than
+``session_ttl`` (and least recently seen first past ``max_sessions``);
+their votes stay in the totals.
+"""
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import metrics
+
+# Stored alongside the statement counters: sessions that have seen the
+# reflection, used as the denominator for "62% of the room"
+PARTICIPANTS = "participants"
+
+
+class _Shard:
+    def __init__(self, n_counters):
+        self.lock = threading.Lock()
+        self.sessions = OrderedDict()  # session id -> (last seen, bools last reported), oldest first
+        self.counts = [0] * n_counters
+        self.participants = 0
+        self.pending = [0] * n_counters
+        self.pending_participants = 0
+
+
+class TallyService:
+    """Sharded, per-session deduplicated counters for ``names``."""
+
+    def __init__(self, store, names, n_shards=16, flush_interval=1.0,
+                 session_ttl=8 * 3600.0, max_sessions=100000, clock=time.monotonic):
+        self.store = store
+        self.names = list(names)
+        self.flush_interval = flush_interval
+        self.session_ttl = session_ttl
+        self._max_per_shard = max(1, max_sessions // n_shards)
+        self._clock = clock
+        self._shards = [_Shard(len(self.names)) for _ in range(n_shards)]
+        stored = store.tallies()
+        self._base = [stored.get(name, 0) for name in self.names]
+        self._base_participants = stored.get(PARTICIPANTS, 0)
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._run_flusher, name="tally-flusher", daemon=True)
+        self._flusher.start()
+
+    def _shard(self, session_id):
+        return self._shards[zlib.crc32(session_id.encode()) % len(self._shards)]
+
+    def record(self, session_id, selections):
+        """Report which statements ``session_id`` currently has ticked.
+
+        ``selections`` holds one bool per name. Only differences from the
+        session's previous report change the counters.
+        """
+        selections = tuple(bool(selected) for selected in selections)
+        if len(selections) != len(self.names):
+            raise ValueError(f"expected {len(self.names)} selections")
+        shard = self._shard(session_id)
+        with shard.lock:
+            now = self._clock()
+            self._expire(shard, now)
+            seen = shard.sessions.get(session_id)
+            previous = seen[1] if seen is not None else None
+            if previous is not None:
+                shard.sessions.move_to_end(session_id)
+            if previous == selections:
+                shard.sessions[session_id] = (now, selections)
+                return
+            if previous is None:
+                shard.participants += 1
+                shard.pending_participants += 1
+                previous = (False,) * len(selections)
+            for i, (before, after) in enumerate(zip(previous, selections)):
+                if before != after:
+                    delta = 1 if after else -1
+                    shard.counts[i] += delta
+                    shard.pending[i] += delta
+            shard.sessions[session_id] = (now, selections)
+
+    def _expire(self, shard, now):
+        # Called with the shard's lock held
+        cutoff = now - self.session_ttl
+        while shard.sessions and (next(iter(shard.sessions.values()))[0] < cutoff
+                                  or len(shard.sessions) > self._max_per_shard):
+            shard.sessions.popitem(last=False)
+
+    def totals(self):
+        """``(participants, {name: count})`` across every session so far."""
+        counts = list(self._base)
+        participants = self._base_participants
+        for shard in self._shards:
+            with shard.lock:
+                participants += shard.participants
+                for i, count in enumerate(shard.counts):
+                    counts[i] += count
+        return participants, dict(zip(self.names, counts))
+
+    def flush(self):
+        """Hand pending changes to the store; returns the write Future or None."""
+        with self._flush_lock:
+            deltas = dict.fromkeys(self.names, 0)
+            deltas[PARTICIPANTS] = 0
+            for shard in self._shards:
+                with shard.lock:
+                    for name, delta in zip(self.names, shard.pending):
+                        deltas[name] += delta
+                    deltas[PARTICIPANTS] += shard.pending_participants
+                    shard.pending = [0] * len(self.names)
+                    shard.pending_participants = 0
+            deltas = {name: delta for name, delta in deltas.items() if delta}
+            if not deltas:
+                return None
+            try:
+                future = self.store.add_tallies(deltas)
+            except Exception:
+                self._restore(deltas)
+                raise
+            metrics.inc("workshop_tally_flushes_total")
+            return future
+
+    def _restore(self, deltas):
+        # Keep unsaved changes for the next flush
+        shard = self._shards[0]
+        with shard.lock:
+            for i, name in enumerate(self.names):
+                shard.pending[i] += deltas.get(name, 0)
+            shard.pending_participants += deltas.get(PARTICIPANTS, 0)
+
+    def close(self):
+        self._stop.set()
+        self._flusher.join()
+        self.flush()
+
+    def _run_flusher(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                # Write queue full or store closing; retried on the next tick
+                metrics.inc("workshop_tally_flush_errors_total")
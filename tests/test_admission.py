@@ -0,0 +1,46 @@
+"""Checks for the submission gate in admission.py."""
+import os
+import sys
+from concurrent.futures import Future
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from admission import ACCEPTED, RATE_LIMITED, SubmissionGate  # noqa: E402
+
+
+class FakeStore:
+    """Stores every write at once and never fills up."""
+
+    max_pending = 100
+    batch_wait = 0.01
+
+    def __init__(self):
+        self.rows = []
+
+    def pending(self):
+        return 0
+
+    def _store(self, *args, timeout=None):
+        self.rows.append(args)
+        future = Future()
+        future.set_result(len(self.rows))
+        return future
+
+    submit_commitment = submit_audit = submit_case_response = _store
+
+
+def test_short_dedup_window_keeps_rate_limit():
+    now = [0.0]
+    gate = SubmissionGate(FakeStore(), dedup_window=10, debounce=0, rate=2, per=60, clock=lambda: now[0])
+
+    def submit(at, text):
+        now[0] = at
+        return gate.submit("session", "commitments", "A", "HR", "Personal", text).status
+
+    assert submit(0, "one") == ACCEPTED
+    assert submit(1, "two") == ACCEPTED
+    assert submit(9, "three") == RATE_LIMITED
+    # Idle for longer than the dedup window, but the bucket holds ~0.67 tokens
+    assert submit(20, "four") == RATE_LIMITED
+    # A full period later the bucket has refilled
+    assert submit(100, "five") == ACCEPTED
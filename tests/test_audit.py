@@ -0,0 +1,63 @@
+"""Checks for the vectorized audit scoring and aggregation in audit.py.
+
+    python -m pytest tests
+"""
+import itertools
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audit import (AUDIT_CATEGORIES, MAX_SCORE, MIN_SCORE, N_FOCUS_AREAS,  # noqa: E402
+                   AuditAggregator, score_batch)
+
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+
+
+def test_score_batch_matches_sorted_on_every_audit():
+    # All 3,125 possible audits; sorted() over (score, index) pairs breaks
+    # ties by the earlier category, which score_batch must reproduce
+    audits = list(itertools.product(SCORES, repeat=len(AUDIT_CATEGORIES)))
+    averages, focus = score_batch(audits)
+    for row, average, chosen in zip(audits, averages, focus):
+        expected = [i for _, i in sorted(zip(row, range(len(row))))[:N_FOCUS_AREAS]]
+        assert list(chosen) == expected, row
+        assert average == pytest.approx(sum(row) / len(row))
+
+
+def test_score_batch_empty():
+    averages, focus = score_batch(np.empty((0, len(AUDIT_CATEGORIES))))
+    assert averages.shape == (0,)
+    assert focus.shape == (0, N_FOCUS_AREAS)
+
+
+def test_score_batch_rejects_wrong_shape():
+    with pytest.raises(ValueError):
+        score_batch([[1, 2, 3]])
+
+
+def test_add_many_matches_add():
+    rng = np.random.default_rng(0)
+    audits = [tuple(int(s) for s in row)
+              for row in rng.integers(MIN_SCORE, MAX_SCORE + 1, (1000, len(AUDIT_CATEGORIES)))]
+    one_by_one = AuditAggregator()
+    for row in audits:
+        one_by_one.add(row)
+    # Uneven chunks, merged into an aggregator that already has data
+    batched = AuditAggregator()
+    batched.add(audits[0])
+    batched.add_many(iter(audits[1:]), chunk_size=333)
+    batched.add_many([])
+
+    expected, actual = one_by_one.snapshot(), batched.snapshot()
+    assert actual["count"] == expected["count"] == len(audits)
+    for key in expected:
+        np.testing.assert_allclose(actual[key], expected[key])
+    for row in audits[:50]:
+        overall, per_category = batched.percentiles(row)
+        expected_overall, expected_per_category = one_by_one.percentiles(row)
+        assert overall == pytest.approx(expected_overall)
+        np.testing.assert_allclose(per_category, expected_per_category)
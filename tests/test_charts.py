@@ -0,0 +1,87 @@
+"""Checks for the chart caches in charts.py."""
+import os
+import sys
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import charts  # noqa: E402
+from charts import ChartCache  # noqa: E402
+
+
+class FinishedPool:
+    """Render pool whose futures are already done when ``submit`` returns."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.submitted = 0
+
+    def submit(self, draw, *args, fmt="png"):
+        self.submitted += 1
+        future = Future()
+        if self.error is not None:
+            future.set_exception(self.error)
+        else:
+            future.set_result(b"image:%r" % (args,))
+        return future
+
+
+def _call(function, *args):
+    # Run in a thread so a deadlock fails the test instead of hanging it
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = function(*args)
+        except Exception as exc:
+            outcome["error"] = exc
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive(), "deadlocked on an already-finished render"
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def test_get_with_finished_render():
+    pool = FinishedPool()
+    cache = ChartCache(lambda key: None, pool=pool)
+    assert _call(cache.get, (1, 2)) == b"image:((1, 2),)"
+    assert _call(cache.get, (1, 2)) == b"image:((1, 2),)"
+    assert pool.submitted == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_get_with_failed_render():
+    cache = ChartCache(lambda key: None, pool=FinishedPool(ValueError("draw failed")))
+    with pytest.raises(ValueError):
+        _call(cache.get, (1, 2))
+    assert cache.stats()["entries"] == 0
+    # The failed render isn't left in flight, so the next miss retries it
+    with pytest.raises(ValueError):
+        _call(cache.get, (1, 2))
+    assert cache._pool.submitted == 2
+
+
+def test_warm_with_finished_renders():
+    pool = FinishedPool()
+    cache = ChartCache(lambda key: None, pool=pool)
+    _call(cache.warm, [(1,), (2,), (1,)])
+    assert pool.submitted == 2
+    assert cache.stats()["entries"] == 2
+
+
+def test_render_static_with_finished_render(monkeypatch):
+    monkeypatch.setattr(charts, "render_pool", FinishedPool())
+    charts.clear_static_cache()
+    try:
+        assert _call(charts.render_static, "test", lambda: None) == b"image:()"
+        assert _call(charts.render_static, "test", lambda: None) == b"image:()"
+        assert charts.render_pool.submitted == 1
+    finally:
+        charts.clear_static_cache()
@@ -0,0 +1,76 @@
+"""Checks for the batching writer in storage.py."""
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage  # noqa: E402
+from storage import SubmissionStore  # noqa: E402
+
+
+class CommitFails:
+    """Connection whose ``with`` block fails to commit while ``failing`` is set."""
+
+    failing = False
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None and CommitFails.failing:
+            self._conn.rollback()
+            raise sqlite3.OperationalError("disk I/O error")
+        return self._conn.__exit__(exc_type, exc, tb)
+
+
+@pytest.fixture
+def store(tmp_path):
+    # A long batch window, so writes submitted together share one batch
+    store = SubmissionStore(str(tmp_path / "test.db"), batch_wait=0.5)
+    yield store
+    store.close()
+
+
+def _submit_good_bad_good(store):
+    return [
+        store.submit_commitment("A", "HR", "Personal", "mentor two juniors"),
+        store.submit_commitment("B", "HR", None, "commitment_type is NOT NULL"),
+        store.submit_commitment("C", "HR", "Team", "share the rota"),
+    ]
+
+
+def test_bad_write_fails_alone(store):
+    good, bad, good_after = _submit_good_bad_good(store)
+    assert good.result(5) < good_after.result(5)
+    with pytest.raises(sqlite3.IntegrityError):
+        bad.result(5)
+    assert [row["name"] for row in store.list_commitments()] == ["C", "A"]
+    items, _ = store.changes_since()
+    assert [item["name"] for item in items] == ["A", "C"]
+
+
+def test_retry_commits_once_for_the_batch(tmp_path, monkeypatch):
+    # If the retry's commit fails, none of the batch may have been stored
+    monkeypatch.setattr(storage, "_connect", lambda path, connect=storage._connect: CommitFails(connect(path)))
+    store = SubmissionStore(str(tmp_path / "test.db"), batch_wait=0.5)
+    try:
+        CommitFails.failing = True
+        futures = _submit_good_bad_good(store)
+        for future in futures:
+            with pytest.raises(sqlite3.Error):
+                future.result(5)
+        CommitFails.failing = False
+        assert store.count_commitments() == 0
+    finally:
+        CommitFails.failing = False
+        store.close()
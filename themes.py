@@ -0,0 +1,162 @@
+"""Incremental theme extraction over free-text submissions.
+
+Documents (a commitment, or a group's insights plus proposed solutions)
+are tokenized once when they arrive and kept as sparse term-count rows:
+a pair of NumPy arrays holding term indices and counts. Each group (a
+case, or a commitment type) also keeps a running term-frequency vector,
+and the index keeps document frequencies, so TF-IDF top terms can be
+computed per group without revisiting old documents. Results are cached
+until the next document arrives (any new document shifts the IDF).
+"""
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before
+being below between both but by can could did do does doing down during each even every few
+for from further get had has have having he her here hers him his how i if in into is it its
+itself just least let like make many may me more most much must my myself need no nor not now
+of off on once only or other our ours out over own per same she should so some such than that
+the their theirs them then there these they this those through to too under until up upon us
+very was we were what when where which while who whom why will with within without would you
+your yours commit commits committed ensure ensuring help helping work working workplace one two
+""".split())
+
+_WORD_RE = re.compile(r"[a-z][a-z'-]+")
+
+
+def _grow(array, size):
+    """Zero-padded copy of ``array`` with room for at least ``size`` entries."""
+    grown = np.zeros(max(size, 2 * array.size, 64), dtype=array.dtype)
+    grown[:array.size] = array
+    return grown
+
+
+def tokenize(text):
+    """Lower-case content words of ``text`` (stopwords and words under 3 letters dropped)."""
+    words = (word.strip("'-") for word in _WORD_RE.findall(text.lower()))
+    return [word for word in words if len(word) > 2 and word not in STOPWORDS]
+
+
+class ThemeIndex:
+    """Sparse term counts per document, grouped by a key, with cached top terms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.vocabulary = {}
+        self.terms = []
+        self._df = np.zeros(256, dtype=np.int64)
+        self._group_tf = {}
+        self._docs = {}  # group -> list of (term indices, counts)
+        self.n_docs = 0
+        self._version = 0
+        self._cache = {}
+
+    def _term_ids(self, tokens):
+        ids = []
+        for token in tokens:
+            idx = self.vocabulary.get(token)
+            if idx is None:
+                idx = self.vocabulary[token] = len(self.terms)
+                self.terms.append(token)
+            ids.append(idx)
+        if len(self.terms) > self._df.size:
+            self._df = _grow(self._df, len(self.terms))
+        return ids
+
+    def add(self, group, text):
+        """Index one document under ``group``; O(number of words in ``text``)."""
+        counts = Counter(tokenize(text))
+        if not counts:
+            return
+        with self._lock:
+            ids = np.array(self._term_ids(counts.keys()), dtype=np.int64)
+            values = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+            self._df[ids] += 1
+            tf = self._group_tf.get(group)
+            if tf is None:
+                tf = self._group_tf[group] = np.zeros(max(self._df.size, 64), dtype=np.int64)
+            elif tf.size < len(self.terms):
+                tf = self._group_tf[group] = _grow(tf, len(self.terms))
+            tf[ids] += values
+            self._docs.setdefault(group, []).append((ids, values))
+            self.n_docs += 1
+            self._version += 1
+
+    def groups(self):
+        with self._lock:
+            return list(self._group_tf)
+
+    def _idf(self, size):
+        df = self._df[:size]
+        return np.log((1 + self.n_docs) / (1 + df)) + 1.0
+
+    def top_terms(self, group, n=10):
+        """``[(term, score)]`` for the ``n`` highest TF-IDF terms in ``group``."""
+        with self._lock:
+            cached = self._cache.get(("terms", group, n))
+            if cached and cached[0] == self._version:
+                return cached[1]
+            tf = self._group_tf.get(group)
+            if tf is None:
+                return []
+            size = min(tf.size, len(self.terms))
+            scores = tf[:size] * self._idf(size)
+            k = min(n, int(np.count_nonzero(scores)))
+            if k == 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            result = [(self.terms[i], round(float(scores[i]), 3)) for i in top]
+            self._cache[("terms", group, n)] = (self._version, result)
+            return result
+
+    def clusters(self, group, n=5):
+        """Documents of ``group`` clustered by their single strongest TF-IDF term.
+
+        Returns ``[(term, document count)]`` for the ``n`` largest clusters.
+        """
+        with self._lock:
+            cached = self._cache.get(("clusters", group, n))
+            if cached and cached[0] == self._version:
+                return cached[1]
+            docs = self._docs.get(group, [])
+            idf = self._idf(len(self.terms))
+            dominant = Counter(self.terms[ids[np.argmax(values * idf[ids])]] for ids, values in docs)
+            result = dominant.most_common(n)
+            self._cache[("clusters", group, n)] = (self._version, result)
+            return result
+
+
+class ThemeTracker:
+    """Keeps theme indexes for commitments and case responses up to date.
+
+    ``update`` pulls only the submissions stored since its last call from
+    the store's change feed.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.commitments = ThemeIndex()   # grouped by commitment_type
+        self.case_responses = ThemeIndex()  # grouped by case title
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+    def update(self, limit=1000):
+        with self._lock:
+            while True:
+                items, self._cursor = self.store.changes_since(self._cursor, limit)
+                for item in items:
+                    if item["kind"] == "commitments":
+                        self.commitments.add(item["commitment_type"], item["commitment"])
+                    elif item["kind"] == "case_responses":
+                        self.case_responses.add(
+                            item["case_title"],
+                            f"{item['group_insights']}\n{item['proposed_solutions']}",
+                        )
+                if len(items) < limit:
+                    return
+
@@ -0,0 +1,38 @@
+"""HTML rendering for the Commitment Wall.
+
+Each page of commitments is built as one HTML block so the whole page is
+sent to the browser in a single ``st.markdown`` delta.
+"""
+from html import escape
+
+COMMITMENT_TYPES = [
+    "Personal Practice Change",
+    "Advocating for Policy Change",
+    "Supporting Colleagues",
+    "Challenging Bias",
+    "Creating Resources",
+    "Other",
+]
+
+PAGE_SIZE = 25
+
+
+def render_commitment(comm, box_class="info-box"):
+    """Render one commitment dict as an HTML box."""
+    department = escape(comm.get("department") or "")
+    if comm.get("name"):
+        who = f"<strong>{escape(comm['name'])}</strong> from <strong>{department}</strong> commits to:"
+    else:
+        who = f"A participant from <strong>{department}</strong> commits to:"
+    return (
+        f"<div class='{box_class}'>"
+        f"<p>{who}</p>"
+        f"<p><em>{escape(comm['commitment'])}</em></p>"
+        f"<p><strong>Area</strong>: {escape(comm['commitment_type'])}</p>"
+        "</div>"
+    )
+
+
+def render_page(commitments, box_class="info-box"):
+    """Render a list of commitments as a single HTML block."""
+    return "".join(render_commitment(comm, box_class) for comm in commitments)
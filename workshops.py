@@ -0,0 +1,119 @@
+"""Workshops (cohorts) and their separate submission stores.
+
+Every cohort joins with a short workshop code, e.g. ``?workshop=icipe-2025``
+in the app URL. Each workshop gets its own SQLite file with its own writer
+thread and reader pool, so one large cohort's submissions or exports never
+queue behind another's. The default workshop keeps using
+``storage.DEFAULT_DB_PATH``; others live in ``WORKSHOP_DATA_DIR``.
+
+Only workshops listed in ``workshops.json`` can be joined; that file also
+holds their titles, sidebar and footer text. Each listed code costs a
+database file and a few threads, so codes typed by participants are never
+used to open new stores.
+"""
+import json
+import os
+import re
+import threading
+
+from storage import DEFAULT_DB_PATH, SubmissionStore
+
+CONFIG_PATH = os.environ.get(
+    "WORKSHOP_CONFIG",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "workshops.json"),
+)
+DATA_DIR = os.environ.get(
+    "WORKSHOP_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(DEFAULT_DB_PATH)), "workshops"),
+)
+
+_CODE_RE = re.compile(r"[a-z0-9][a-z0-9-]{0,39}")
+
+
+def normalize_code(code):
+    """Canonical form of a workshop code; raises ``ValueError`` if malformed."""
+    normalized = str(code).strip().lower().replace(" ", "-")
+    if not _CODE_RE.fullmatch(normalized):
+        raise ValueError("Workshop codes use 1-40 letters, digits and dashes.")
+    return normalized
+
+
+class WorkshopDirectory:
+    """Known workshops plus the default code, loaded from ``workshops.json``."""
+
+    def __init__(self, workshops, default):
+        self.workshops = {normalize_code(code): info for code, info in workshops.items()}
+        self.default = normalize_code(default)
+
+    @classmethod
+    def from_file(cls, path=CONFIG_PATH):
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(config.get("workshops", {}), config["default"])
+
+    def codes(self):
+        return sorted(set(self.workshops) | {self.default})
+
+    def resolve(self, code):
+        """Canonical code of a listed workshop; raises ``ValueError`` otherwise."""
+        code = normalize_code(code)
+        if code != self.default and code not in self.workshops:
+            raise ValueError(f"There is no workshop with the code {code!r}.")
+        return code
+
+    def info(self, code):
+        """Display text for ``code``: ``title``, ``sidebar`` and ``footer`` lines."""
+        info = self.workshops.get(code, {})
+        title = info.get("title", code)
+        return {
+            "title": title,
+            "sidebar": info.get("sidebar", [f"**Workshop: {title}**"]),
+            "footer": info.get("footer", [f"Workshop: {title}"]),
+        }
+
+
+class StoreRegistry:
+    """Opens one ``SubmissionStore`` per workshop code on first use.
+
+    When ``allowed`` is given, any other code raises ``ValueError``.
+    """
+
+    def __init__(self, default_code, default_path=DEFAULT_DB_PATH, data_dir=DATA_DIR,
+                 allowed=None, **store_options):
+        self.default_code = default_code
+        self.allowed = None if allowed is None else frozenset(allowed) | {default_code}
+        self.default_path = default_path
+        self.data_dir = data_dir
+        self.store_options = store_options
+        self._stores = {}
+        self._lock = threading.Lock()
+
+    def path(self, code):
+        if code == self.default_code:
+            return self.default_path
+        return os.path.join(self.data_dir, f"{code}.db")
+
+    def get(self, code):
+        store = self._stores.get(code)
+        if store is not None:
+            return store
+        if self.allowed is not None and code not in self.allowed:
+            raise ValueError(f"unknown workshop code: {code!r}")
+        with self._lock:
+            store = self._stores.get(code)
+            if store is None:
+                path = self.path(code)
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                store = self._stores[code] = SubmissionStore(path, **self.store_options)
+        return store
+
+    def codes(self):
+        """Codes of the stores opened so far."""
+        with self._lock:
+            return list(self._stores)
+
+    def close(self):
+        with self._lock:
+            stores, self._stores = list(self._stores.values()), {}
+        for store in stores:
+            store.close()